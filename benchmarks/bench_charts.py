@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""차트 생성 벤치마크 - Figure 구성 + 압축 payload 직렬화까지 (WebView 렌더링은 제외)"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def render_frame(ohlcv):
+    return main.prepare_render_frame(main.add_indicators(ohlcv.copy()))
+
+
+@pytest.mark.parametrize("builder", [main.build_chart1_html, main.build_chart2_html, main.build_chart3_html],
+                         ids=["chart1", "chart2", "chart3"])
+def bench_build_chart_html(benchmark, render_frame, builder):
+    html = benchmark.pedantic(builder, args=(render_frame,), rounds=3, iterations=1)
+    benchmark.extra_info["html_bytes"] = len(html)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""지표 계산 벤치마크 - 봉 수(단일 종목)와 종목 수(wide 패널) 두 축으로 측정"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import main  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def jit_warmup():
+    # numba 커널 컴파일 시간이 첫 측정에 섞이지 않도록 미리 한 번 실행
+    from conftest import make_ohlcv
+    main.add_indicators(make_ohlcv(100))
+
+
+def bench_calc_rsi(benchmark, ohlcv):
+    benchmark(main.calc_rsi, ohlcv["Close"], 14)
+
+
+def bench_calc_macd(benchmark, ohlcv):
+    benchmark(main.calc_macd, ohlcv["Close"])
+
+
+def bench_calc_bollinger(benchmark, ohlcv):
+    benchmark(main.calc_bollinger, ohlcv["Close"])
+
+
+def bench_add_indicators(benchmark, ohlcv):
+    benchmark(lambda: main.add_indicators(ohlcv.copy()))
+
+
+def bench_direction_summary(benchmark, ohlcv):
+    df = main.add_indicators(ohlcv.copy())
+    benchmark(main.direction_summary, df)
+
+
+def bench_get_direction_analysis(benchmark, panel):
+    # 종목마다 한 번씩 판정 (관심종목/스크리너의 종목별 루프와 같은 형태)
+    stats = main.calc_rolling_stats(panel, mean_windows=(20, 60), std_windows=())
+    rows = list(zip(panel.iloc[-1], stats["mean"][20].iloc[-1], stats["mean"][60].iloc[-1],
+                    main.calc_rsi(panel, 14).iloc[-1]))
+    benchmark(lambda: [main.get_direction_analysis(*row) for row in rows])
+
+
+def bench_panel_rsi(benchmark, panel):
+    benchmark(main.calc_rsi, panel, 14)
+
+
+def bench_panel_macd(benchmark, panel):
+    benchmark(main.calc_macd, panel)
+
+
+def bench_panel_bollinger(benchmark, panel):
+    benchmark(main.calc_bollinger, panel)
+
+
+def bench_summarize_panel(benchmark, panel):
+    benchmark(main.summarize_panel, panel)
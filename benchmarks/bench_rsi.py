@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+RSI 계산 경로 비교 벤치마크
+- pandas 경로(diff → where → ewm) vs 단일 패스 커널(순수 파이썬 / numba JIT)
+- 각 경로의 결과가 pandas 경로와 비트 단위로 같은지도 함께 확인
+
+사용법: python benchmarks/bench_rsi.py [--sizes 1000 100000 1000000] [--tickers 1] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import main
+
+
+def random_walk(n: int, k: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=(n, k)), axis=0))
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main_bench(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="RSI pandas 경로 vs 커널 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--tickers", type=int, default=1, help="열(종목) 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-python", action="store_true", help="순수 파이썬 커널 생략 (대용량에서 느림)")
+    args = parser.parse_args(argv)
+
+    jit = None
+    try:
+        import numba
+        jit = numba.njit(cache=False, nogil=True, error_model="numpy")(main._wilder_rsi_kernel)
+    except ImportError:
+        print("numba 미설치 - JIT 경로 생략", file=sys.stderr)
+
+    print(f"{'bars':>10} {'tickers':>8} {'path':>8} {'sec':>10} {'x pandas':>9} {'exact':>6}")
+    for n in args.sizes:
+        values = random_walk(n, args.tickers)
+        frame = pd.DataFrame(values) if args.tickers > 1 else pd.Series(values[:, 0])
+        expected = main.calc_rsi_pandas(frame).to_numpy().reshape(values.shape)
+        base = best_of(lambda: main.calc_rsi_pandas(frame), args.repeat)
+        print(f"{n:>10} {args.tickers:>8} {'pandas':>8} {base:>10.4f} {1.0:>9.2f} {'-':>6}")
+
+        paths = []
+        if jit is not None:
+            jit(values[:50], 14, np.empty_like(values[:50]))  # 컴파일 시간 제외
+            paths.append(("numba", jit))
+        if not args.skip_python:
+            paths.append(("python", main._wilder_rsi_kernel))
+        for name, kernel in paths:
+            repeat = args.repeat if name == "numba" else 1
+            sec = best_of(lambda: main.calc_rsi_kernel(values, 14, kernel), repeat)
+            exact = np.array_equal(main.calc_rsi_kernel(values, 14, kernel), expected, equal_nan=True)
+            print(f"{n:>10} {args.tickers:>8} {name:>8} {sec:>10.4f} {base / sec:>9.2f} {str(exact):>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_bench())
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+지표 계산·차트 생성 경로 벤치마크 (pytest-benchmark)
+
+    pip install pytest pytest-benchmark
+    pytest benchmarks                                  # 기본 크기 (250 ~ 25,000봉, 1 ~ 50종목)
+    pytest benchmarks --bench-large                    # 대용량 포함 (최대 1,000,000봉, 500종목)
+    pytest benchmarks --benchmark-compare              # baselines/ 의 최신 기준치와 비교
+    pytest benchmarks --benchmark-save=<이름>          # 새 기준치 저장 (성능 변경 커밋과 함께 올린다)
+
+기준치는 benchmarks/baselines/ 에 저장된다. 기계마다 절대값이 다르므로 같은 기계에서 비교할 것.
+pytest-benchmark가 없으면 각 벤치 모듈이 통째로 건너뛴다.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+BAR_SIZES = [250, 2_500, 25_000]
+BAR_SIZES_LARGE = [250_000, 1_000_000]
+TICKER_COUNTS = [1, 50]
+TICKER_COUNTS_LARGE = [500]
+PANEL_BARS = 250  # 다종목 벤치의 종목당 봉 수 (1년치 일봉)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-large", action="store_true", help="대용량 크기(25만~100만봉, 500종목)까지 측정")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # 기준치 저장 위치를 실행 위치와 무관하게 benchmarks/baselines 로 고정
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = "file://" + BASELINE_DIR
+
+
+def pytest_generate_tests(metafunc):
+    large = metafunc.config.getoption("--bench-large")
+    if "bars" in metafunc.fixturenames:
+        metafunc.parametrize("bars", BAR_SIZES + (BAR_SIZES_LARGE if large else []))
+    if "tickers" in metafunc.fixturenames:
+        metafunc.parametrize("tickers", TICKER_COUNTS + (TICKER_COUNTS_LARGE if large else []))
+
+
+def synthetic_index(n: int) -> pd.DatetimeIndex:
+    """영업일 인덱스. 10만봉을 넘으면 기원전 날짜가 되어 plotly JSON 직렬화가 죽으므로 분봉 간격으로 만든다"""
+    if n <= 100_000:
+        return pd.bdate_range(end="2024-12-31", periods=n, name="Date")
+    return pd.date_range(end="2024-12-31", periods=n, freq="min", name="Date")
+
+
+def make_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    """랜덤 워크 기반 합성 일봉 OHLCV (영업일 인덱스)"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = close * np.exp(rng.normal(0.0, 0.005, n))
+    spread = np.abs(rng.normal(0.0, 0.01, n))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * (1 + spread),
+        "Low": np.minimum(open_, close) * (1 - spread),
+        "Close": close,
+        "Volume": rng.integers(100_000, 10_000_000, n).astype(np.float64),
+    }, index=synthetic_index(n))
+
+
+def make_panel(n: int, k: int, seed: int = 0) -> pd.DataFrame:
+    """종가 wide 프레임 (날짜 × 티커)"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (n, k)), axis=0))
+    return pd.DataFrame(close, index=synthetic_index(n),
+                        columns=[f"T{i:04d}" for i in range(k)])
+
+
+@pytest.fixture
+def ohlcv(bars):
+    return make_ohlcv(bars)
+
+
+@pytest.fixture
+def panel(tickers):
+    return make_panel(PANEL_BARS, tickers)
@@ -6,8 +6,29 @@
 - Flet + yfinance + Plotly
 """
 
+from __future__ import annotations
+
+import time
+
+_IMPORT_T0 = time.perf_counter()
+
+import base64
+import copy
+import hashlib
+import importlib
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
 import os
+import re
 import shutil
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 # ==========================================
 # [긴급 패치] SSL 인증서 경로 오류 해결 (Windows 한글 경로 대응, Android에서는 미적용)
@@ -31,26 +52,890 @@ def fix_ssl_korean_path():
 
 fix_ssl_korean_path()
 
-import flet as ft
-import yfinance as yf
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+# ==========================================
+# 무거운 의존성 지연 import (Android 콜드 스타트 단축)
+# ==========================================
+IMPORT_TIMINGS = {}  # 모듈 이름 -> import 소요 시간(초)
+
+
+class _LazyModule:
+    """첫 속성 접근 시에 실제 모듈을 import 하는 프록시"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            t0 = time.perf_counter()
+            module = importlib.import_module(self._name)
+            IMPORT_TIMINGS.setdefault(self._name, time.perf_counter() - t0)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def warm_imports():
+    """분석에 필요한 모듈을 미리 import (UI 표시 후 백그라운드 스레드에서 호출)"""
+    for module in (np, pd, yf, go, _subplots):
+        try:
+            module._load()
+        except Exception:
+            pass
+
+
+def report_startup_timings(**extra):
+    """STA_PROFILE_STARTUP=1 이면 import/첫 화면 시간을 stderr와 startup.jsonl에 기록"""
+    if not os.getenv("STA_PROFILE_STARTUP"):
+        return
+    record = {"ts": time.time(), "platform": sys.platform, "imports": dict(IMPORT_TIMINGS), **extra}
+    line = json.dumps(record, ensure_ascii=False)
+    print(line, file=sys.stderr)
+    with open(os.path.join(get_cache_dir(), "startup.jsonl"), "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+ft = _LazyModule("flet")  # GUI(main)에서만 사용 - 헤드리스 CLI는 flet 없이 동작
+yf = _LazyModule("yfinance")
+np = _LazyModule("numpy")
+pd = _LazyModule("pandas")
+go = _LazyModule("plotly.graph_objects")
+_subplots = _LazyModule("plotly.subplots")
+_pio = _LazyModule("plotly.io")
+_webview = _LazyModule("flet_webview")  # 선택: 모바일·macOS에서 차트를 JS를 실행할 수 있는 WebView에 띄운다
 from datetime import datetime, timedelta
 
+MODULE_IMPORT_SEC = time.perf_counter() - _IMPORT_T0
+
+
+# ========== 데이터 캐시 ==========
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+HISTORY_REFRESH_SEC = 15 * 60  # 마지막 조회 후 이 시간 안에는 네트워크 재조회 생략
+
+
+def get_cache_dir(*parts: str) -> str:
+    """앱 데이터 저장 경로 (Android: FLET_APP_STORAGE_DATA, 데스크톱: ~/.sta_cache)"""
+    base = os.getenv("FLET_APP_STORAGE_DATA") or os.path.join(os.path.expanduser("~"), ".sta_cache")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _ohlcv_cache_path(ticker: str, auto_adjust: bool, interval: str = "1d") -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    mode = "adj" if auto_adjust else "raw"
+    suffix = "" if interval == "1d" else f"_{interval}"  # 일봉은 기존 캐시 파일 이름 유지
+    return os.path.join(get_cache_dir("ohlcv"), f"{safe}_{mode}{suffix}.pkl")
+
+
+def _naive_index(df: pd.DataFrame) -> pd.DatetimeIndex:
+    """거래소 현지 시각 기준 tz 없는 인덱스 (캐시 구간 비교용)"""
+    idx = df.index
+    return idx.tz_localize(None) if getattr(idx, "tz", None) is not None else idx
+
+
+def _fetch_history(stock, start: pd.Timestamp, end: pd.Timestamp, auto_adjust: bool) -> pd.DataFrame:
+    df = stock.history(start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"), auto_adjust=auto_adjust)
+    return df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+
+
+def _close_matches(a: float, b: float) -> bool:
+    return abs(a - b) <= 1e-6 * max(abs(a), abs(b), 1.0)
+
+
+def _read_ohlcv_cache(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        return None
+
+
+def _write_ohlcv_cache(path: str, rec: dict):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pd.to_pickle(rec, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _slice_window(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    if df.empty:
+        return df
+    idx = _naive_index(df)
+    return df.loc[(idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))].copy()
+
+
+def _to_cache_frame(df: pd.DataFrame, rec: dict) -> pd.DataFrame:
+    """캐시 형식(거래소 현지 시각, tz 없음)으로. 인덱스에 시간대가 있으면 rec["tz"]에 기록한다.
+
+    stock.history는 tz가 있는 인덱스를, 일봉 yf.download는 tz 없는 인덱스를 돌려주므로 캐시에는 tz 없이 저장하고
+    시간대 이름은 따로 들고 있다가 load_history가 돌려줄 때 다시 붙인다 (장 시간 판단에 사용).
+    """
+    tz = getattr(df.index, "tz", None)
+    if tz is None:
+        return df
+    rec["tz"] = str(tz)
+    df = df.copy()
+    df.index = df.index.tz_localize(None)
+    return df
+
+
+def _from_cache_frame(df: pd.DataFrame, rec: dict) -> pd.DataFrame:
+    tz = rec.get("tz")
+    if tz is None or df.empty:
+        return df
+    df.index = df.index.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+    return df
+
+
+def load_history(ticker: str, start: datetime, end: datetime, auto_adjust: bool = True,
+                 offline: bool = False, max_age: float = HISTORY_REFRESH_SEC) -> pd.DataFrame:
+    """디스크 캐시를 거친 stock.history - 캐시에 없는 날짜 구간만 받아 병합한다.
+
+    캐시는 티커·수정주가 여부별 pickle 파일 하나이며 {"start", "end", "fetched_at", "tz", "df"}로 구성된다.
+    (pyarrow는 Android 빌드에 포함되지 않아 Parquet/Feather 대신 pandas pickle 사용)
+    offline=True 이면 네트워크 없이 캐시에 있는 구간만 돌려준다. 마지막 조회가 max_age초보다 오래되면 끝부분을 다시 받는다.
+    """
+    path = _ohlcv_cache_path(ticker, auto_adjust)
+    start_d = pd.Timestamp(start).normalize()
+    end_d = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)  # yfinance end는 미포함
+
+    rec = _read_ohlcv_cache(path)
+    if rec is not None:
+        rec["df"] = _to_cache_frame(rec["df"], rec)  # 예전 캐시(tz 있는 인덱스) 호환
+    if offline:
+        if rec is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return _from_cache_frame(_slice_window(rec["df"], start, end), rec)
+    stock = yf.Ticker(ticker)
+
+    def fetch(a: pd.Timestamp, b: pd.Timestamp) -> pd.DataFrame:
+        return _to_cache_frame(_fetch_history(stock, a, b, auto_adjust), rec)
+
+    dirty = True
+    if rec is None or rec["df"].empty:
+        rec = {"tz": rec.get("tz") if rec else None}
+        df = fetch(start_d, end_d)
+        rec.update(start=start_d, end=end_d, fetched_at=time.time(), df=df)
+    else:
+        dirty = False
+        cached = rec["df"]
+        parts = [cached]
+        if start_d < rec["start"]:
+            parts.insert(0, fetch(start_d, rec["start"]))
+            rec["start"] = start_d
+            dirty = True
+        stale = time.time() - rec["fetched_at"] > max_age
+        if end_d > rec["end"] or stale:
+            # 마지막 봉은 장중 미확정일 수 있으므로 확정된 직전 봉부터 다시 받아 덮어쓴다
+            anchor = cached.index[-2] if len(cached) >= 2 else cached.index[-1]
+            anchor_d = pd.Timestamp(anchor.strftime("%Y-%m-%d"))
+            tail = fetch(anchor_d, max(end_d, rec["end"]))
+            if anchor in tail.index and not _close_matches(cached.loc[anchor, "Close"], tail.loc[anchor, "Close"]):
+                # 배당·분할로 수정주가가 바뀜 → 캐시 폐기 후 전체 재조회
+                parts = [fetch(rec["start"], max(end_d, rec["end"]))]
+            else:
+                parts.append(tail)
+            rec["end"] = max(end_d, rec["end"])
+            rec["fetched_at"] = time.time()
+            dirty = True
+        parts = [p for p in parts if not p.empty]
+        df = pd.concat(parts) if parts else cached
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        rec["df"] = df
+
+    if dirty and not rec["df"].empty:
+        _write_ohlcv_cache(path, rec)
+
+    return _from_cache_frame(_slice_window(rec["df"], start, end), rec)
+
+
+def store_history(ticker: str, df: pd.DataFrame, start: datetime, end: datetime, auto_adjust: bool = True):
+    """일괄 조회(yf.download)로 받은 구간을 load_history와 같은 디스크 캐시에 병합"""
+    if df.empty:
+        return
+    path = _ohlcv_cache_path(ticker, auto_adjust)
+    start_d = pd.Timestamp(start).normalize()
+    end_d = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    rec = _read_ohlcv_cache(path) or {"tz": None}
+    df = _to_cache_frame(df[[c for c in OHLCV_COLUMNS if c in df.columns]], rec)
+    if rec.get("df") is not None and not rec["df"].empty:
+        cached = _to_cache_frame(rec["df"], rec)
+        merged = pd.concat([cached, df])
+        rec["df"] = merged[~merged.index.duplicated(keep="last")].sort_index()
+        if start_d <= rec["end"] and end_d >= rec["start"]:
+            rec["start"] = min(rec["start"], start_d)
+            rec["end"] = max(rec["end"], end_d)
+        elif end_d > rec["end"]:
+            # 사이가 비면 구간은 최신 쪽만 인정 - 빈 구간은 다음 load_history가 start 확장으로 채운다
+            rec["start"], rec["end"] = start_d, end_d
+    else:
+        rec.update(start=start_d, end=end_d, df=df)
+    rec["fetched_at"] = time.time()
+    _write_ohlcv_cache(path, rec)
+
+
+def cached_tickers(auto_adjust: bool = True) -> list[str]:
+    """디스크 캐시에 OHLCV가 있는 티커 목록"""
+    suffix = "_adj.pkl" if auto_adjust else "_raw.pkl"
+    return sorted(f[:-len(suffix)] for f in os.listdir(get_cache_dir("ohlcv")) if f.endswith(suffix))
+
+
+# ========== 분봉 (인트라데이) ==========
+INTERVALS = [("1d", "일봉"), ("1h", "1시간봉"), ("15m", "15분봉"), ("5m", "5분봉"), ("1m", "1분봉")]
+# Yahoo 분봉 제한: (요청 한 번에 받을 수 있는 일수, 오늘부터 조회 가능한 과거 일수) - 경계에서 하루씩 여유를 둔다
+INTRADAY_LIMITS = {"1h": (365, 729), "15m": (59, 59), "5m": (59, 59), "1m": (7, 29)}
+INTRADAY_REFRESH_SEC = {"1h": 300, "15m": 60, "5m": 60, "1m": 30}  # 이 시간 안에는 재조회 생략 (= 스트리밍 주기)
+
+
+def intraday_max_days(interval: str) -> int:
+    """분봉 간격별로 고를 수 있는 최대 기간(일). 일봉은 제한 없음"""
+    return INTRADAY_LIMITS[interval][1] - 1 if interval in INTRADAY_LIMITS else PERIOD_MAX_DAYS
+
+
+def _fetch_intraday(stock, start: pd.Timestamp, end: pd.Timestamp, interval: str, auto_adjust: bool) -> pd.DataFrame:
+    """Yahoo 요청당 기간 제한에 맞춰 구간을 나눠 받은 분봉을 이어 붙인다 (시각은 거래소 현지 기준)"""
+    chunk = pd.Timedelta(days=INTRADAY_LIMITS[interval][0])
+    parts = []
+    t = start
+    while t < end:
+        t_end = min(t + chunk, end)
+        df = stock.history(start=t.to_pydatetime(), end=t_end.to_pydatetime(), interval=interval, auto_adjust=auto_adjust)
+        parts.append(df[[c for c in OHLCV_COLUMNS if c in df.columns]])
+        t = t_end
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    df = pd.concat(parts)
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def load_intraday(ticker: str, start: datetime, end: datetime, interval: str, auto_adjust: bool = True,
+                  offline: bool = False, max_age: float | None = None) -> pd.DataFrame:
+    """load_history의 분봉 버전 - 간격별 캐시 파일에 마지막 봉 이후만 받아 이어 붙인다.
+
+    마지막 봉은 진행 중일 수 있으므로 그 봉부터 다시 받아 덮어쓴다. Yahoo가 주지 않는 과거(INTRADAY_LIMITS)는
+    요청하지 않으며, 캐시는 조회 가능 기간의 두 배까지만 보관한다.
+    """
+    path = _ohlcv_cache_path(ticker, auto_adjust, interval)
+    lookback = pd.Timedelta(days=INTRADAY_LIMITS[interval][1])
+    earliest = pd.Timestamp.now() - lookback
+    start_t = max(pd.Timestamp(start), earliest)
+    # 인덱스는 거래소 현지 시각이라 기기 시각(end)과 시차가 있으므로 end 당일 봉은 모두 포함한다
+    end_t = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+
+    rec = _read_ohlcv_cache(path)
+    if offline:
+        return _slice_window(rec["df"], start, end_t) if rec is not None else pd.DataFrame(columns=OHLCV_COLUMNS)
+    stock = yf.Ticker(ticker)
+
+    if rec is None or rec["df"].empty or start_t < rec["start"]:
+        df = _fetch_intraday(stock, start_t, end_t, interval, auto_adjust)
+        if rec is not None and not rec["df"].empty:
+            df = pd.concat([rec["df"], df])
+        rec = {"start": start_t, "end": end_t, "fetched_at": time.time(), "df": df}
+    elif end_t > rec["end"] or time.time() - rec["fetched_at"] > (INTRADAY_REFRESH_SEC[interval] if max_age is None else max_age):
+        cached = rec["df"]
+        tail = _fetch_intraday(stock, _naive_index(cached)[-1], max(end_t, rec["end"]), interval, auto_adjust)
+        rec["df"] = pd.concat([cached, tail]) if not tail.empty else cached
+        rec["end"] = max(end_t, rec["end"])
+        rec["fetched_at"] = time.time()
+    else:
+        return _slice_window(rec["df"], start, end_t)
+
+    df = rec["df"]
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    rec["df"] = df[_naive_index(df) >= earliest - lookback]
+    if not rec["df"].empty:
+        _write_ohlcv_cache(path, rec)
+    return _slice_window(rec["df"], start, end_t)
+
+
+# ========== 자동 새로고침 ==========
+AUTO_REFRESH_SEC = 30  # 일봉 자동 새로고침 주기 (장중)
+AUTO_REFRESH_MAX_SEC = 300  # 새 봉이 없거나 조회가 실패하면 주기를 두 배씩 늘리는 상한
+AUTO_REFRESH_OFF_HOURS_SEC = 1800  # 장 마감 후 마지막 조회를 마치면 이 간격으로만 개장 여부를 확인
+# 거래소 시간대별 정규장 (현지 시각) - 휴장일은 새 봉이 없어 백오프로 처리된다
+MARKET_HOURS = {
+    "America/New_York": ("09:30", "16:00"),
+    "Asia/Seoul": ("09:00", "15:30"),
+    "Asia/Tokyo": ("09:00", "15:30"),
+    "Asia/Hong_Kong": ("09:30", "16:00"),
+    "Europe/London": ("08:00", "16:30"),
+}
+
+
+def market_session(tz) -> tuple[bool, float]:
+    """(지금 정규장 중인지, 다음 개장까지 남은 초) - tz는 가격 인덱스의 거래소 시간대"""
+    tz_name = str(tz) if tz is not None else "America/New_York"
+    open_s, close_s = MARKET_HOURS.get(tz_name, ("09:00", "16:00"))
+    now = pd.Timestamp.now(tz=tz_name)
+    for offset in range(8):
+        day = now.normalize() + pd.Timedelta(days=offset)
+        if day.dayofweek >= 5:
+            continue
+        open_t = day + pd.Timedelta(f"{open_s}:00")
+        close_t = day + pd.Timedelta(f"{close_s}:00")
+        if now < close_t:
+            return open_t <= now, max((open_t - now).total_seconds(), 0.0)
+    return False, float(AUTO_REFRESH_OFF_HOURS_SEC)
+
+
+# ========== 종목 메타데이터 캐시 ==========
+META_TTL_SEC = 30 * 24 * 3600  # 회사명은 거의 바뀌지 않으므로 30일
+META_MISS_TTL_SEC = 24 * 3600  # 종목명이 없는 티커는 하루 동안 다시 조회하지 않는다
+
+
+class MetadataCache:
+    """stock.info 종목명 TTL 캐시 (앱 재시작 후에도 유지).
+
+    만료된 값도 즉시 돌려주고 백그라운드 스레드에서 갱신한다(stale-while-revalidate).
+    캐시에 없는 티커만 동기적으로 조회한다. 종목명이 없는 티커는 name=None으로 miss_ttl 동안 기억한다.
+    """
+
+    def __init__(self, path: str, ttl: float = META_TTL_SEC, miss_ttl: float = META_MISS_TTL_SEC):
+        self._path = path
+        self._ttl = ttl
+        self._miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._data = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self):
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path)
+
+    def _fetch(self, ticker: str) -> str:
+        try:
+            info = yf.Ticker(ticker).info
+        except Exception:
+            return ticker
+        name = info.get("longName") or info.get("shortName") or None
+        with self._lock:
+            self._data[ticker] = {"name": name, "fetched_at": time.time()}
+            try:
+                self._save()
+            except OSError:
+                pass  # 디스크에 못 써도 메모리 값으로 계속 쓴다
+        return name or ticker
+
+    def _refresh_async(self, ticker: str):
+        with self._lock:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+
+        def run():
+            try:
+                self._fetch(ticker)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(ticker)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def peek(self, ticker: str) -> str | None:
+        """네트워크 조회 없이 캐시된 종목명만 반환"""
+        with self._lock:
+            entry = self._data.get(ticker)
+        return entry["name"] if entry else None
+
+    def get_name(self, ticker: str) -> str:
+        with self._lock:
+            entry = self._data.get(ticker)
+        if entry is None:
+            return self._fetch(ticker)
+        if time.time() - entry["fetched_at"] > (self._ttl if entry["name"] else self._miss_ttl):
+            self._refresh_async(ticker)
+        return entry["name"] or ticker
+
+
+_metadata_cache = None
+
+
+def get_metadata_cache() -> MetadataCache:
+    global _metadata_cache
+    if _metadata_cache is None:
+        _metadata_cache = MetadataCache(os.path.join(get_cache_dir(), "metadata.json"))
+    return _metadata_cache
+
+
+# ========== 세션 스냅샷 ==========
+PERIOD_MIN_DAYS = 90
+PERIOD_MAX_DAYS = 3650  # 차트는 화면 폭에 맞춰 다운샘플링되므로 10년치도 렌더링 부담이 같다
+DEFAULT_SESSION = {"ticker": "AAPL", "period": 365, "watchlist": "AAPL, MSFT, NVDA, TSLA, 005930.KS",
+                   "render_mode": os.getenv("STA_CHART_RENDER", "auto"), "interval": "1d", "auto_refresh": False,
+                   "debug_overlay": False}
+
+
+def load_session() -> dict:
+    """지난 세션에서 마지막으로 분석한 티커·기간·관심종목 (없으면 기본값)"""
+    try:
+        with open(os.path.join(get_cache_dir(), "session.json"), "r", encoding="utf-8") as f:
+            session = {**DEFAULT_SESSION, **json.load(f)}
+        session["period"] = min(max(int(session["period"]), PERIOD_MIN_DAYS), PERIOD_MAX_DAYS)
+        if session["render_mode"] not in RENDER_MODES:
+            session["render_mode"] = "auto"
+        if session["interval"] not in dict(INTERVALS):
+            session["interval"] = "1d"
+        return session
+    except Exception:
+        return dict(DEFAULT_SESSION)
+
+
+def save_session(**values):
+    """지정한 항목만 갱신해 session.json에 저장"""
+    session = {**load_session(), **values}
+    path = os.path.join(get_cache_dir(), "session.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ========== 단계별 시간 측정 ==========
+DEBUG_OVERLAY = os.getenv("STA_DEBUG_OVERLAY") == "1"  # 1: 대시보드 헤더의 단계별 소요 시간을 켠 채 시작 (사이드바 스위치로도 켜고 끈다)
+STAGE_LOG_MAX_BYTES = 1_000_000  # stages.jsonl 이 이 크기를 넘으면 .1 로 돌리고 새로 시작
+
+
+class StageTimer:
+    """로드 한 번의 단계별 소요 시간(ms)과 페이로드 크기(bytes)를 모아 stages.jsonl에 기록"""
+
+    def __init__(self, kind: str, **context):
+        self.kind = kind
+        self.context = context
+        self.stages = {}
+        self.sizes = {}
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, sec: float):
+        # 여러 스레드(history/info 동시 조회)에서 불려도 키가 달라 안전
+        self.stages[name] = round(self.stages.get(name, 0.0) + sec * 1000, 1)
+
+    def size(self, name: str, nbytes: int):
+        self.sizes[name] = self.sizes.get(name, 0) + int(nbytes)
+
+    def summary(self) -> str:
+        total = (time.perf_counter() - self._t0) * 1000
+        parts = [f"{name} {ms:.0f}" for name, ms in self.stages.items()]
+        return f"⏱ {total:.0f}ms = " + " · ".join(parts) if parts else f"⏱ {total:.0f}ms"
+
+    def write(self, **extra):
+        record = {"ts": time.time(), "kind": self.kind, **self.context, "platform": sys.platform,
+                  "total_ms": round((time.perf_counter() - self._t0) * 1000, 1),
+                  "stages_ms": self.stages, "bytes": self.sizes, **extra}
+        try:
+            path = os.path.join(get_cache_dir(), "stages.jsonl")
+            if os.path.exists(path) and os.path.getsize(path) > STAGE_LOG_MAX_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            pass  # 측정 로그 실패가 화면 표시를 막으면 안 된다
+
+
+def _timed(timer: StageTimer | None, name: str, fn, *args):
+    if timer is None:
+        return fn(*args)
+    with timer.stage(name):
+        return fn(*args)
+
+
+# ========== 데이터 로딩 파이프라인 ==========
+IO_WORKERS = 4
+_io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="sta-io")
+
+
+def set_io_workers(tickers: int):
+    """tickers개 종목을 동시에 조회할 수 있게 I/O 풀 크기를 맞춘다 (종목마다 history·info 두 작업)"""
+    global _io_pool, IO_WORKERS
+    workers = max(4, 2 * tickers)
+    if workers != IO_WORKERS:
+        old, _io_pool, IO_WORKERS = _io_pool, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sta-io"), workers
+        old.shutdown(wait=False)
+
+
+def fetch_inputs(ticker: str, start: datetime, end: datetime, auto_adjust: bool = True,
+                 timer: StageTimer | None = None, interval: str = "1d") -> tuple[pd.DataFrame, str]:
+    """가격 이력과 종목명을 동시에 조회한다 (지연 시간 = max(history, info))"""
+    meta = get_metadata_cache()
+    if interval == "1d":
+        hist_future = _io_pool.submit(_timed, timer, "history", load_history, ticker, start, end, auto_adjust)
+    else:
+        hist_future = _io_pool.submit(_timed, timer, "history", load_intraday, ticker, start, end, interval, auto_adjust)
+    name_future = _io_pool.submit(_timed, timer, "info", meta.get_name, ticker)
+    df = hist_future.result()
+    if timer is not None:
+        timer.size("history", df.memory_usage(deep=False).sum())
+    return df, name_future.result()
+
+
+MIN_BARS = 60  # MA60 계산에 필요한 최소 봉 수
+
+
+def analyze_ticker(ticker: str, period: int, auto_adjust: bool = True,
+                   interval: str = "1d") -> tuple[pd.DataFrame, str, dict]:
+    """GUI와 같은 조회 → 지표 → 진단 파이프라인 (헤드리스용). (지표 포함 df, 종목명, 진단 요약)을 반환"""
+    end = datetime.now()
+    period = min(period, intraday_max_days(interval))
+    df, name = fetch_inputs(ticker, end - timedelta(days=period), end, auto_adjust, interval=interval)
+    if df.empty or len(df) < MIN_BARS:
+        raise ValueError(f"{ticker}: 데이터가 부족합니다 ({len(df)}봉)")
+    add_indicators(df)
+    prepare_render_frame(df)
+    return df, name, direction_summary(df)
+
+
+# ========== 관심종목 (배치 조회) ==========
+TABLE_MAX_ROWS = 300  # 표에 그리는 최대 행 수 (스크리너 결과 수천 개 대응)
+WATCHLIST_COLUMNS = [("티커", "ticker"), ("현재가", "price"), ("20일 이평", "ma20"), ("60일 이평", "ma60"),
+                     ("RSI(14)", "rsi"), ("진단", "opinion")]
+
+
+def parse_tickers(text: str) -> list[str]:
+    """쉼표·공백·줄바꿈으로 구분된 티커 목록 (중복 제거, 입력 순서 유지)"""
+    return list(dict.fromkeys(t for t in re.split(r"[,\s]+", (text or "").upper()) if t))
+
+
+def download_batch(tickers: list[str], start: datetime, end: datetime, auto_adjust: bool = True) -> pd.DataFrame:
+    """yf.download 한 번으로 여러 종목을 병렬 조회 → (티커, 필드) MultiIndex 컬럼 패널"""
+    raw = yf.download(tickers, start=start, end=end, auto_adjust=auto_adjust,
+                      group_by="ticker", threads=True, progress=False)
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+    if not isinstance(raw.columns, pd.MultiIndex):
+        raw = pd.concat({tickers[0]: raw}, axis=1)
+    return raw
+
+
+def to_wide(panel: pd.DataFrame, field: str = "Close") -> pd.DataFrame:
+    """MultiIndex 패널((티커, 필드) 또는 (필드, 티커))에서 한 필드만 꺼낸 날짜 × 티커 프레임"""
+    if not isinstance(panel.columns, pd.MultiIndex):
+        return panel
+    level = 1 if field in panel.columns.get_level_values(1) else 0
+    return panel.xs(field, axis=1, level=level)
+
+
+def align_panel(wide: pd.DataFrame) -> pd.DataFrame:
+    """종목마다 휴장일이 다른 wide 프레임에서 각 종목의 유효 값만 아래쪽(최근)으로 모은다.
+
+    행 i는 더 이상 같은 날짜가 아니라 '종목별 끝에서 n-i번째 봉'이며, 마지막 행이 종목별 최신 봉이다.
+    이렇게 맞추면 중간 NaN 없이 rolling/ewm을 열 단위로 한 번에 계산할 수 있다.
+    """
+    values = wide.to_numpy(dtype=float)
+    order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+    return pd.DataFrame(np.take_along_axis(values, order, axis=0), columns=wide.columns)
+
+
+def empty_summary(ticker: str) -> dict:
+    return {"ticker": ticker, "price": None, "ma20": None, "ma60": None, "rsi": None, "opinion": "데이터 없음"}
+
+
+def summarize_panel(close: pd.DataFrame) -> list[dict]:
+    """wide 종가 프레임(날짜 × 티커)의 종목별 현재가·MA20/MA60·RSI·진단을 벡터 연산 한 번으로 계산"""
+    aligned = align_panel(close)
+    stats = calc_rolling_stats(aligned, mean_windows=(20, 60), std_windows=())
+    last = pd.DataFrame({
+        "price": aligned.iloc[-1],
+        "ma20": stats["mean"][20].iloc[-1],
+        "ma60": stats["mean"][60].iloc[-1],
+        "rsi": calc_rsi(aligned, 14).iloc[-1],
+        "count": aligned.notna().sum(),
+    })
+    rows = []
+    for ticker, r in last.iterrows():
+        if r["count"] < MIN_BARS:
+            rows.append(empty_summary(ticker))
+            continue
+        analysis = get_direction_analysis(r["price"], r["ma20"], r["ma60"], r["rsi"])
+        rows.append({"ticker": ticker, "price": float(r["price"]), "ma20": float(r["ma20"]), "ma60": float(r["ma60"]),
+                     "rsi": float(r["rsi"]), "opinion": analysis["opinion"]})
+    return rows
+
+
+def analyze_watchlist(tickers: list[str], period: int) -> list[dict]:
+    end = datetime.now()
+    panel = download_batch(tickers, end - timedelta(days=period), end)
+    found = {r["ticker"]: r for r in (summarize_panel(to_wide(panel, "Close")) if not panel.empty else [])}
+    return [found.get(t) or empty_summary(t) for t in tickers]
+
+
+# ========== 스크리너 (프로세스 풀) ==========
+SCREENER_CHUNK_SIZE = 200
+IS_MOBILE = os.getenv("FLET_PLATFORM", "").lower() in ("android", "ios")  # 모바일은 프로세스 풀 미지원
+
+
+def load_universe(path: str | None = None) -> list[str]:
+    """스크리닝 대상 티커 목록.
+
+    파일은 한 줄에 티커 하나(CSV면 첫 열, '#' 주석 허용)이며, 기본 파일(<캐시>/universe.txt)이
+    없으면 디스크 캐시에 OHLCV가 있는 전체 티커를 대상으로 한다.
+    """
+    path = path or os.path.join(get_cache_dir(), "universe.txt")
+    if not os.path.exists(path):
+        return cached_tickers()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        cells = [line.split(",")[0] for line in f if line.strip() and not line.lstrip().startswith("#")]
+    return [t for t in parse_tickers("\n".join(cells)) if t not in ("TICKER", "SYMBOL")]
+
+
+def _screen_chunk(tickers: list[str], period: int, refresh: bool) -> list[dict]:
+    """풀 작업 단위: 티커 묶음을 디스크 캐시에서 읽어 wide 프레임 하나로 요약 (refresh면 먼저 일괄 조회)"""
+    end = datetime.now()
+    start = end - timedelta(days=period)
+    if refresh:
+        panel = download_batch(tickers, start, end)
+        if not panel.empty:
+            for t in panel.columns.get_level_values(0).unique():
+                store_history(t, panel[t].dropna(how="all"), start, end)
+    closes = {}
+    for t in tickers:
+        df = load_history(t, start, end, offline=True)
+        if not df.empty:
+            closes[t] = pd.Series(df["Close"].to_numpy(), index=_naive_index(df))
+    found = {r["ticker"]: r for r in summarize_panel(pd.concat(closes, axis=1).sort_index())} if closes else {}
+    return [found.get(t) or empty_summary(t) for t in tickers]
+
+
+def run_screener(tickers: list[str], period: int = 365, chunk_size: int = SCREENER_CHUNK_SIZE,
+                 workers: int | None = None, refresh: bool = False, use_processes: bool | None = None):
+    """티커를 chunk_size 묶음으로 풀에 나눠 보내고, 끝나는 순서대로 (완료 수, 전체 수, 결과 행)을 내보낸다.
+
+    제너레이터를 중간에 닫으면 대기 중인 묶음은 취소된다.
+    """
+    if use_processes is None:
+        use_processes = not IS_MOBILE
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers or 4, thread_name_prefix="sta-screen")
+    try:
+        futures = {
+            executor.submit(_screen_chunk, tickers[i:i + chunk_size], period, refresh): tickers[i:i + chunk_size]
+            for i in range(0, len(tickers), chunk_size)
+        }
+        done = 0
+        for future in as_completed(futures):
+            try:
+                rows = future.result()
+            except Exception:
+                rows = [empty_summary(t) for t in futures[future]]
+            done += len(rows)
+            yield done, len(tickers), rows
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ========== 백그라운드 작업 ==========
+class JobCancelled(Exception):
+    """새 작업에 밀려 취소된 작업을 중단할 때 사용"""
+
+
+class JobToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def sleep(self, seconds: float):
+        """seconds 동안 대기하되 취소되면 바로 JobCancelled"""
+        if self._event.wait(seconds):
+            raise JobCancelled()
+
+
+class JobRunner:
+    """페이지당 하나의 작업만 유효하게 유지하는 스레드 실행기.
+
+    새 작업이 들어오면 진행 중인 작업의 토큰을 취소한다. 이미 시작된 네트워크 호출은
+    중간에 끊을 수 없으므로, 이전 작업은 다음 단계 경계(token.check())에서 결과를 버리고 종료된다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._token = None
+
+    def submit(self, fn, *args, **kwargs) -> JobToken:
+        token = JobToken()
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+            self._token = token
+
+        def run():
+            try:
+                fn(*args, token=token, **kwargs)
+            except JobCancelled:
+                pass
+            finally:
+                with self._lock:
+                    if self._token is token:
+                        self._token = None
+
+        threading.Thread(target=run, daemon=True).start()
+        return token
+
+    def cancel(self):
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+                self._token = None
+
 
 # ========== 지표 계산 함수 ==========
-def calc_rsi(series: pd.Series, period: int = 14) -> pd.Series:
+KERNEL_MODE = os.getenv("STA_KERNEL", "auto")  # auto: numba 있으면 JIT 커널 / python: 순수 파이썬 커널 / off: pandas
+RSI_KERNEL = os.getenv("STA_RSI_KERNEL", KERNEL_MODE)
+_kernels = {}
+
+
+def _load_kernel(fn, mode: str):
+    """mode에 따른 커널 함수 (auto: numba JIT, python: 원본 함수, off 또는 numba 없음: None)"""
+    key = (fn.__name__, mode)
+    if key not in _kernels:
+        kernel = None
+        if mode == "python":
+            kernel = fn
+        elif mode == "auto":
+            try:
+                # Android 등 앱 폴더가 읽기 전용인 환경을 위해 JIT 캐시는 앱 데이터 폴더에 둔다
+                os.environ.setdefault("NUMBA_CACHE_DIR", get_cache_dir("numba"))
+                import numba
+                kernel = numba.njit(cache=True, nogil=True, error_model="numpy")(fn)
+            except Exception:
+                kernel = None
+        _kernels[key] = kernel
+    return _kernels[key]
+
+
+def _wilder_rsi_kernel(values, period, out):
+    """Wilder RSI 단일 패스 커널 (values/out: (n, k) float64, 열마다 독립 계산).
+
+    calc_rsi의 pandas 경로(diff → where → ewm(adjust=True) → 나눗셈)와 연산 순서를 그대로 따라
+    결과가 비트 단위로 같다. numba가 있으면 njit로 컴파일되어 쓰인다.
+    """
+    alpha = 1.0 / period
+    com = (1.0 - alpha) / alpha  # pandas와 같은 방식으로 alpha → com → alpha 변환
+    factor = 1.0 - 1.0 / (1.0 + com)
+    nan = math.nan
+    n, k = values.shape
+    for j in range(k):
+        prev = nan
+        started = False
+        avg_gain = nan
+        avg_loss = nan
+        wt_gain = 1.0
+        wt_loss = 1.0
+        nobs = 0
+        for i in range(n):
+            x = values[i, j]
+            if not started and x == x:
+                started = True
+            if started:
+                delta = x - prev
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                nobs += 1
+            else:
+                gain = nan
+                loss = nan
+            prev = x
+
+            if i == 0:
+                avg_gain = gain
+                avg_loss = loss
+            else:
+                if avg_gain == avg_gain:
+                    wt_gain *= factor
+                    if started:
+                        if avg_gain != gain:
+                            avg_gain = (wt_gain * avg_gain + 1.0 * gain) / (wt_gain + 1.0)
+                        wt_gain += 1.0
+                elif started:
+                    avg_gain = gain
+                if avg_loss == avg_loss:
+                    wt_loss *= factor
+                    if started:
+                        if avg_loss != loss:
+                            avg_loss = (wt_loss * avg_loss + 1.0 * loss) / (wt_loss + 1.0)
+                        wt_loss += 1.0
+                elif started:
+                    avg_loss = loss
+
+            if nobs < period:
+                out[i, j] = nan
+            elif avg_loss == 0.0:
+                # x/0 = inf → RSI 100, 0/0 = NaN (pandas 나눗셈과 동일)
+                out[i, j] = 100.0 if avg_gain > 0.0 else nan
+            else:
+                out[i, j] = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+    return out
+
+
+def get_rsi_kernel():
+    """RSI_KERNEL 설정에 따른 커널 함수 (pandas 경로를 쓸 때는 None)"""
+    return _load_kernel(_wilder_rsi_kernel, RSI_KERNEL)
+
+
+def calc_rsi_kernel(values: np.ndarray, period: int = 14, kernel=None) -> np.ndarray:
+    """1차원 또는 (n, k) 배열의 Wilder RSI를 커널로 계산 (kernel 미지정 시 JIT → 순수 파이썬 순)"""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    arr2d = arr[:, None] if arr.ndim == 1 else arr
+    kernel = kernel or get_rsi_kernel() or _wilder_rsi_kernel
+    out = kernel(arr2d, period, np.empty_like(arr2d))
+    return out.reshape(arr.shape)
+
+
+# 아래 함수들은 Series 하나뿐 아니라 wide DataFrame(날짜 × 티커)도 받아 종목 전체를 한 번에 계산한다.
+def calc_rsi(series: pd.Series | pd.DataFrame, period: int = 14) -> pd.Series | pd.DataFrame:
+    kernel = get_rsi_kernel()
+    if kernel is None:
+        return calc_rsi_pandas(series, period)
+    out = calc_rsi_kernel(series.to_numpy(dtype=np.float64), period, kernel)
+    if isinstance(series, pd.DataFrame):
+        return pd.DataFrame(out, index=series.index, columns=series.columns)
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+def calc_rsi_pandas(series: pd.Series | pd.DataFrame, period: int = 14) -> pd.Series | pd.DataFrame:
     delta = series.diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = (-delta).where(delta < 0, 0.0)
+    # 상장 전(앞쪽 NaN) 구간은 0이 아닌 결측으로 두어 종목별 단독 계산과 결과를 맞춘다
+    started = series.notna().cummax()
+    gain = delta.where(delta > 0, 0.0).where(started)
+    loss = (-delta).where(delta < 0, 0.0).where(started)
     avg_gain = gain.ewm(alpha=1 / period, min_periods=period).mean()
     avg_loss = loss.ewm(alpha=1 / period, min_periods=period).mean()
     rs = avg_gain / avg_loss
     return 100.0 - (100.0 / (1.0 + rs))
 
 
-def calc_macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+def calc_macd(series: pd.Series | pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9):
     ema_fast = series.ewm(span=fast, adjust=False).mean()
     ema_slow = series.ewm(span=slow, adjust=False).mean()
     macd_line = ema_fast - ema_slow
@@ -59,14 +944,114 @@ def calc_macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9
     return macd_line, signal_line, histogram
 
 
-def calc_bollinger(series: pd.Series, period: int = 20, std_dev: float = 2.0):
-    ma = series.rolling(window=period).mean()
-    std = series.rolling(window=period).std()
+def _rolling_stats_kernel(values, windows, want_std, nobs, mean, ssq, mean_out, std_out):
+    """여러 창의 rolling 평균·표준편차(ddof=1)를 데이터 한 번 순회로 계산 (창별 Welford 추가/제거).
+
+    values: (n, k) float64, windows: (m,) int64, want_std: (m,) bool,
+    nobs/mean/ssq: (m,) 작업 버퍼, 출력: (m, n, k).
+    창 안에 NaN이 있으면 NaN (rolling(window=w)의 min_periods=w와 동일).
+    """
+    n, k = values.shape
+    m = windows.shape[0]
+    nan = math.nan
+    for j in range(k):
+        nobs[:] = 0
+        mean[:] = 0.0
+        ssq[:] = 0.0
+        for i in range(n):
+            x = values[i, j]
+            for q in range(m):
+                w = windows[q]
+                if x == x:
+                    nobs[q] += 1
+                    d = x - mean[q]
+                    mean[q] += d / nobs[q]
+                    ssq[q] += d * (x - mean[q])
+                if i >= w:
+                    y = values[i - w, j]
+                    if y == y:
+                        nobs[q] -= 1
+                        if nobs[q] == 0:
+                            mean[q] = 0.0
+                            ssq[q] = 0.0
+                        else:
+                            d = y - mean[q]
+                            mean[q] -= d / nobs[q]
+                            ssq[q] -= d * (y - mean[q])
+                if nobs[q] < w:
+                    mean_out[q, i, j] = nan
+                    std_out[q, i, j] = nan
+                else:
+                    mean_out[q, i, j] = mean[q]
+                    if want_std[q] and w > 1:
+                        std_out[q, i, j] = math.sqrt(max(ssq[q], 0.0) / (w - 1))
+                    else:
+                        std_out[q, i, j] = nan
+    return mean_out, std_out
+
+
+def calc_rolling_stats(series: pd.Series | pd.DataFrame, mean_windows=(20, 60), std_windows=(20,)) -> dict:
+    """여러 창 길이의 rolling 평균·표준편차를 한 단계에서 중복 없이 계산.
+
+    커널(numba JIT)이 있으면 모든 창을 데이터 한 번 순회로 처리하고, 없으면 창마다 pandas
+    rolling 한 번씩만 계산한다. 같은 창의 평균은 한 번만 만들어 MA·볼린저 중간선이 함께 쓴다.
+    반환: {"mean": {창: 결과}, "std": {창: 결과}} - 결과는 입력과 같은 형태(Series/DataFrame)
+    """
+    windows = sorted(set(mean_windows) | set(std_windows))
+    result = {"mean": {}, "std": {}}
+    kernel = _load_kernel(_rolling_stats_kernel, KERNEL_MODE)
+    if kernel is None:
+        for w in windows:
+            rolling = series.rolling(window=w)
+            result["mean"][w] = rolling.mean()
+            if w in std_windows:
+                result["std"][w] = rolling.std()
+        return result
+
+    values = np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+    x = values[:, None] if values.ndim == 1 else values
+    m = len(windows)
+    shape = (m,) + x.shape
+    means, stds = kernel(x, np.array(windows, dtype=np.int64), np.array([w in std_windows for w in windows]),
+                         np.zeros(m, dtype=np.int64), np.zeros(m), np.zeros(m), np.empty(shape), np.empty(shape))
+    for q, w in enumerate(windows):
+        for key, arr in (("mean", means[q]), ("std", stds[q])):
+            if key == "std" and w not in std_windows:
+                continue
+            if values.ndim == 1:
+                result[key][w] = pd.Series(arr[:, 0], index=series.index, name=series.name)
+            else:
+                result[key][w] = pd.DataFrame(arr, index=series.index, columns=series.columns)
+    return result
+
+
+def calc_bollinger(series: pd.Series | pd.DataFrame, period: int = 20, std_dev: float = 2.0, stats: dict | None = None):
+    """볼린저 밴드 - calc_rolling_stats 결과(stats)를 넘기면 같은 창의 평균을 다시 계산하지 않는다"""
+    stats = stats or calc_rolling_stats(series, mean_windows=(period,), std_windows=(period,))
+    ma = stats["mean"][period]
+    std = stats["std"][period]
     upper = ma + (std * std_dev)
     lower = ma - (std * std_dev)
     return ma, upper, lower
 
 
+def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """MA20/MA60, RSI, MACD, 볼린저 밴드 컬럼 추가 (이동평균·표준편차는 calc_rolling_stats 한 번으로 계산)"""
+    stats = calc_rolling_stats(df["Close"], mean_windows=(20, 60), std_windows=(20,))
+    df["MA20"] = stats["mean"][20]
+    df["MA60"] = stats["mean"][60]
+    df["RSI"] = calc_rsi(df["Close"], 14)
+    macd_line, signal_line, hist = calc_macd(df["Close"])
+    df["MACD"] = macd_line
+    df["MACD_Signal"] = signal_line
+    df["MACD_Hist"] = hist
+    bb_ma, bb_upper, bb_lower = calc_bollinger(df["Close"], stats=stats)
+    df["BB_Middle"] = bb_ma  # MA20과 같은 계산 결과 (다시 계산하지 않음)
+    df["BB_Upper"] = bb_upper
+    df["BB_Lower"] = bb_lower
+    return df
+
+
 def get_direction_analysis(price: float, ma20: float, ma60: float, rsi: float) -> dict:
     result = {"opinion": "관망 필요", "details": []}
     if pd.isna(ma20) or pd.isna(rsi):
@@ -101,231 +1086,1328 @@ def get_direction_analysis(price: float, ma20: float, ma60: float, rsi: float) -
     return result
 
 
+def direction_summary(df: pd.DataFrame) -> dict:
+    """지표가 계산된 df의 마지막 봉 기준 현재가·이평·RSI와 방향성 진단"""
+    last = df.iloc[-1]
+    analysis = get_direction_analysis(last["Close"], last["MA20"], last["MA60"], last["RSI"])
+    return {
+        "price": last["Close"], "ma20": last["MA20"], "ma60": last["MA60"], "rsi": last["RSI"],
+        "opinion": analysis["opinion"], "details": analysis["details"],
+    }
+
+
+# ========== 증분 지표 엔진 ==========
+INDICATOR_COLUMNS = ["MA20", "MA60", "RSI", "MACD", "MACD_Signal", "MACD_Hist", "BB_Middle", "BB_Upper", "BB_Lower"]
+INDICATOR_ENGINE_MAX_KEYS = 16
+INDICATOR_ENGINE_MAX_BYTES = 16 * 1024 * 1024  # 상태로 들고 있는 지표 배열 크기 상한 (봉당 72 bytes)
+
+
+class _Ewm:
+    """pandas ewm(...).mean()을 한 값씩 갱신 (pandas 구현과 같은 연산 순서라 결과가 일치)"""
+
+    __slots__ = ("old_wt_factor", "new_wt", "adjust", "minp", "weighted", "old_wt", "nobs", "started")
+
+    def __init__(self, com: float, adjust: bool, min_periods: int = 0):
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.minp = max(min_periods, 1)
+        self.weighted = float("nan")
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.started = False
+
+    @classmethod
+    def from_span(cls, span: int, adjust: bool = False) -> "_Ewm":
+        return cls((span - 1) / 2.0, adjust)
+
+    @classmethod
+    def from_alpha(cls, alpha: float, min_periods: int = 0) -> "_Ewm":
+        return cls((1.0 - alpha) / alpha, True, min_periods)
+
+    def seed(self, last_weighted: float, nobs: int):
+        """벡터 연산으로 계산한 마지막 값으로 상태를 복원 (NaN 없는 시계열 가정)"""
+        self.weighted = last_weighted
+        self.nobs = nobs
+        self.started = nobs > 0
+        if self.adjust:
+            # old_wt = 1 + f + f^2 + ... (관측 nobs개)
+            f = self.old_wt_factor
+            self.old_wt = (1.0 - f ** nobs) / (1.0 - f) if nobs > 0 else 1.0
+        else:
+            self.old_wt = 1.0
+
+    def push(self, cur: float) -> float:
+        is_obs = cur == cur
+        self.nobs += is_obs
+        if not self.started:
+            self.weighted = cur
+            self.started = True
+        elif self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_obs:
+                if self.weighted != cur:
+                    self.weighted = self.old_wt * self.weighted + self.new_wt * cur
+                    self.weighted /= self.old_wt + self.new_wt
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        elif is_obs:
+            self.weighted = cur
+        return self.weighted if self.nobs >= self.minp else float("nan")
+
+
+class _IndicatorCursor:
+    """add_indicators 한 행 분량의 계산 상태 (EMA·Wilder 평균·최근 60개 종가)"""
+
+    def __init__(self):
+        self.prev_close = float("nan")
+        self.avg_gain = _Ewm.from_alpha(1 / 14, min_periods=14)
+        self.avg_loss = _Ewm.from_alpha(1 / 14, min_periods=14)
+        self.ema_fast = _Ewm.from_span(12)
+        self.ema_slow = _Ewm.from_span(26)
+        self.ema_signal = _Ewm.from_span(9)
+        self.window = deque(maxlen=60)
+
+    @classmethod
+    def from_frame(cls, close: pd.Series) -> "_IndicatorCursor":
+        """close 전체를 처리한 직후의 상태를 벡터 연산으로 복원"""
+        cur = cls()
+        n = len(close)
+        if n == 0:
+            return cur
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0.0)
+        loss = (-delta).where(delta < 0, 0.0)
+        cur.avg_gain.seed(gain.ewm(alpha=1 / 14).mean().iloc[-1], n)
+        cur.avg_loss.seed(loss.ewm(alpha=1 / 14).mean().iloc[-1], n)
+        ema_fast = close.ewm(span=12, adjust=False).mean()
+        ema_slow = close.ewm(span=26, adjust=False).mean()
+        signal_line = (ema_fast - ema_slow).ewm(span=9, adjust=False).mean()
+        cur.ema_fast.seed(ema_fast.iloc[-1], n)
+        cur.ema_slow.seed(ema_slow.iloc[-1], n)
+        cur.ema_signal.seed(signal_line.iloc[-1], n)
+        cur.prev_close = float(close.iloc[-1])
+        cur.window.extend(close.iloc[-60:].tolist())
+        return cur
+
+    def step(self, close: float) -> tuple:
+        delta = close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(self.avg_gain.push(gain)) / np.float64(self.avg_loss.push(loss))
+            rsi = float(100.0 - (100.0 / (1.0 + rs)))
+        fast = self.ema_fast.push(close)
+        slow = self.ema_slow.push(close)
+        macd = fast - slow
+        signal = self.ema_signal.push(macd)
+
+        self.window.append(close)
+        nan = float("nan")
+        ma60 = float(np.mean(self.window)) if len(self.window) >= 60 else nan
+        if len(self.window) >= 20:
+            last20 = np.fromiter(itertools.islice(self.window, len(self.window) - 20, None), float, 20)
+            ma20 = float(last20.mean())
+            std20 = float(last20.std(ddof=1))
+        else:
+            ma20 = std20 = nan
+        return (ma20, ma60, rsi, macd, signal, macd - signal, ma20, ma20 + std20 * 2.0, ma20 - std20 * 2.0)
+
+
+class IndicatorEngine:
+    """종목별 지표 상태를 유지하며 새로 붙은 봉만 계산한다 (지표 계산은 O(새 봉 수), 컬럼 조립은 memcpy 한 번).
+
+    같은 key로 넘어온 df의 앞부분이 직전 호출과 같으면(시작 시각·직전 봉 일치) 이어서 계산하고,
+    아니면 add_indicators로 전체를 다시 계산한 뒤 상태를 복원한다. 마지막 봉은 장중에 값이
+    바뀔 수 있으므로 항상 '마지막 봉 직전' 상태에서 다시 계산한다.
+    """
+
+    def __init__(self, max_keys: int = INDICATOR_ENGINE_MAX_KEYS, max_bytes: int = INDICATOR_ENGINE_MAX_BYTES):
+        self._max_keys = max_keys
+        self._max_bytes = max_bytes
+        # key -> (base 커서, 처리한 봉 수, 시작 시각, 직전 봉 시각, 직전 봉 종가, 컬럼별 float64 배열)
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, key, df: pd.DataFrame) -> pd.DataFrame:
+        with self._lock:
+            state = self._states.pop(key, None)
+        n = len(df)
+        close = df["Close"]
+        if state is not None and n >= state[1] >= 2 and df.index[0] == state[2] \
+                and df.index[state[1] - 2] == state[3] and close.iloc[state[1] - 2] == state[4]:
+            base, done, _, _, _, prev = state
+            start = done - 1
+        else:
+            add_indicators(df)
+            if n < 2:
+                return df
+            base = _IndicatorCursor.from_frame(close.iloc[:-1])
+            prev = None
+            start = n - 1
+
+        closes = close.to_numpy(dtype=float)
+        tail = np.empty((n - start, len(INDICATOR_COLUMNS)))
+        for i in range(start, n):
+            if i == n - 1:
+                last_base = copy.deepcopy(base)
+            tail[i - start] = base.step(closes[i])
+        if prev is not None:
+            # 전체 재계산이면 add_indicators 값이 이미 들어 있으므로 이어서 계산한 경우만 이전 배열 + 새 봉으로 조립
+            for j, col in enumerate(INDICATOR_COLUMNS):
+                df[col] = np.concatenate((prev[col][:start], tail[:, j]))
+        # 프레임의 컬럼 버퍼를 복사 없이 참조 (결과가 AnalysisCache에 있는 동안은 같은 메모리)
+        values = {col: df[col].to_numpy(dtype=np.float64) for col in INDICATOR_COLUMNS}
+
+        with self._lock:
+            self._states[key] = (last_base, n, df.index[0], df.index[n - 2], closes[n - 2], values)
+            while len(self._states) > 1 and (len(self._states) > self._max_keys or self._nbytes() > self._max_bytes):
+                self._states.popitem(last=False)
+        return df
+
+    def _nbytes(self) -> int:
+        return sum(values.nbytes for state in self._states.values() for values in state[5].values())
+
+
+_indicator_engine = IndicatorEngine()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    return _indicator_engine
+
+
+# ========== 분석 결과 캐시 ==========
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("STA_ANALYSIS_CACHE_MB", "64")) * 1024 * 1024  # 모바일 메모리 상한
+
+
+def bars_fingerprint(df: pd.DataFrame) -> str:
+    """봉 시각과 OHLCV 값의 해시 - 같은 데이터면 같은 값"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(df.index.asi8.tobytes())
+    h.update(np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+class AnalysisResult:
+    """(ticker, period, 봉 간격, 데이터 해시) 하나의 분석 결과: 지표 프레임, 진단, 탭별 차트 HTML"""
+
+    def __init__(self, key: tuple, df: pd.DataFrame, analysis: dict):
+        self.key = key
+        self.df = df
+        self.analysis = analysis
+        self.charts = {}  # (최대 점 수, 렌더링 모드, 탭 번호) -> 차트 HTML
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.df.memory_usage(deep=True).sum()) + sum(len(html) for html in self.charts.values())
+
+
+class AnalysisCache:
+    """분석 결과 LRU. 프레임과 차트 HTML 크기의 합이 max_bytes를 넘으면 오래 안 본 결과부터 버린다"""
+
+    def __init__(self, max_bytes: int = ANALYSIS_CACHE_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> [결과, 바이트]
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> AnalysisResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, result: AnalysisResult):
+        nbytes = result.nbytes
+        with self._lock:
+            self._discard(result.key)
+            self._entries[result.key] = [result, nbytes]
+            self._total += nbytes
+            self._evict()
+
+    def add_chart(self, result: AnalysisResult, chart_key: tuple, html: str):
+        """탭을 처음 열 때 만든 차트 HTML을 결과에 붙이고 크기를 반영"""
+        with self._lock:
+            result.charts[chart_key] = html
+            entry = self._entries.get(result.key)
+            if entry is not None and entry[0] is result:
+                entry[1] += len(html)
+                self._total += len(html)
+                self._entries.move_to_end(result.key)
+                self._evict()
+
+    def discard(self, key: tuple):
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total -= entry[1]
+
+    def _evict(self):
+        # 가장 최근 결과(화면에 떠 있는 것)는 상한을 넘어도 남긴다
+        while self._total > self._max_bytes and len(self._entries) > 1:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._total -= nbytes
+
+
+_analysis_cache = AnalysisCache()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    return _analysis_cache
+
+
+def analyze_bars(ticker: str, period: int, interval: str, df: pd.DataFrame,
+                 timer: StageTimer | None = None) -> AnalysisResult:
+    """df(OHLCV)의 지표·진단을 계산한다. 같은 데이터로 계산해 둔 결과가 있으면 그대로 돌려준다"""
+    key = (ticker, period, interval, bars_fingerprint(df))
+    result = get_analysis_cache().get(key)
+    if result is not None:
+        return result
+    _timed(timer, "indicators", get_indicator_engine().update, (ticker, period, interval), df)
+    _timed(timer, "analysis", prepare_render_frame, df)
+    result = AnalysisResult(key, df, _timed(timer, "analysis", direction_summary, df))
+    get_analysis_cache().put(result)
+    return result
+
+
 # ========== 차트 생성 함수 ==========
-def build_chart1_html(df: pd.DataFrame) -> str:
+UP_COLOR = "#26a69a"
+DOWN_COLOR = "#ef5350"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+PLOTLY_JS_SRC = "/plotly.min.js"  # Flet assets_dir 기준 경로 - 모든 차트가 같은 로컬 파일을 공유
+CHART_CONFIG = {"displayModeBar": True, "responsive": True}
+
+
+def ensure_plotly_asset(dst_dir: str = ASSETS_DIR) -> str:
+    """설치된 plotly 패키지의 plotly.min.js를 dst_dir(기본: assets 폴더)에 복사 (CDN 없이 오프라인 표시)"""
+    import plotly
+    src = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    dst = os.path.join(dst_dir, os.path.basename(PLOTLY_JS_SRC))
+    if not os.path.exists(dst) or os.path.getsize(dst) != os.path.getsize(src):
+        os.makedirs(dst_dir, exist_ok=True)
+        shutil.copyfile(src, dst)
+    return dst
+
+
+# 차트 HTML 셸: figure는 압축 payload(JSON + base64 typed array)로 넘기고 staRender가 풀어서 그린다
+CHART_RENDER_JS = """
+var STA_TYPES = {u1: Uint8Array, i4: Int32Array, f4: Float32Array, f8: Float64Array};
+function staDecode(v) {
+  if (Array.isArray(v)) return v.map(staDecode);
+  if (v && typeof v === 'object') {
+    if (v.levels !== undefined) return Array.from(staDecode(v.codes), function (c) { return v.levels[c]; });
+    if (v.bdata !== undefined) {
+      var s = atob(v.bdata), bytes = new Uint8Array(s.length);
+      for (var i = 0; i < s.length; i++) bytes[i] = s.charCodeAt(i);
+      return new STA_TYPES[v.dtype](bytes.buffer);
+    }
+    Object.keys(v).forEach(function (k) { v[k] = staDecode(v[k]); });
+  }
+  return v;
+}
+window.staRender = function (p) {
+  var xs = p.x.map(function (v) {
+    var dt = staDecode(v.dt), x = new Float64Array(dt.length);
+    for (var i = 0; i < dt.length; i++) x[i] = v.t0 + dt[i] * v.unit;
+    return x;
+  });
+  var data = staDecode(p.data);
+  data.forEach(function (tr) { tr.x = xs[tr.x]; });  // 같은 x축을 쓰는 트레이스는 배열 하나를 공유
+  Plotly.newPlot('sta-chart', data, p.layout, p.config);
+};
+// 스트리밍용 (WebView 호스트): 각 트레이스에서 p.x[0] 이후 점(다시 받은 마지막 봉)을 잘라내고 새 점만 이어 붙인다
+function staLike(target, values) {
+  return ArrayBuffer.isView(target) ? new target.constructor(values) : Array.from(values);
+}
+window.staPatch = function (p) {
+  var gd = document.getElementById('sta-chart');
+  if (!gd || !gd.data) return;
+  p.traces.forEach(function (fields, i) {
+    var tr = gd.data[i], cut = tr.x.length;
+    while (cut > 0 && tr.x[cut - 1] >= p.x[0]) cut--;
+    var trim = {x: [tr.x.slice(0, cut)]}, ext = {x: [staLike(tr.x, p.x)]};
+    Object.keys(fields).forEach(function (key) {
+      var v = key.split('.').reduce(function (o, k) { return o[k]; }, tr);
+      trim[key] = [v.slice(0, cut)];
+      ext[key] = [staLike(v, staDecode(fields[key]))];
+    });
+    if (cut < tr.x.length) Plotly.restyle(gd, trim, [i]);
+    Plotly.extendTraces(gd, ext, [i]);
+  });
+};
+"""
+CHART_SHELL_HTML = (
+    '<div id="sta-chart" style="width:100%"></div>\n'
+    '<script src="{src}"></script>\n'
+    '<script>{js}staRender({payload});</script>'
+)
+CHART_FLOAT32_RESOLUTION = 1e-5  # float32 반올림 오차가 값 범위의 이 비율 이하일 때만 f4로 보낸다 (화면에서 구분 불가)
+
+
+def chart_x(index) -> np.ndarray:
+    """날짜 인덱스를 Plotly 날짜축의 숫자 값(ms)으로. 시간대가 있으면 거래소 현지 시각 그대로 표시되도록 시간대를 뗀다"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy(dtype="datetime64[ms]").astype(np.float64)
+
+
+def _typed_array(values: np.ndarray, dtype: str | None = None) -> dict:
+    """숫자 배열을 Plotly typed array 형식 {"dtype", "bdata"}로. dtype을 안 주면 정밀도가 충분할 때 float32로 줄인다"""
+    values = np.asarray(values, dtype=np.float64)
+    if dtype is None:
+        finite = values[np.isfinite(values)]
+        dtype = "f8"
+        if len(finite) == 0 or np.abs(finite).max() * 2.0 ** -24 <= np.ptp(finite) * CHART_FLOAT32_RESOLUTION:
+            dtype = "f4"
+    return {"dtype": dtype, "bdata": base64.b64encode(values.astype("<" + dtype).tobytes()).decode("ascii")}
+
+
+def figure_payload(fig) -> dict:
+    """figure를 전송용 dict로. 숫자 배열은 base64 typed array, x축은 트레이스끼리 같은 배열을 한 번만 담는다"""
+    spec = fig.to_plotly_json()
+    xs, shared, data = [], [], []
+    for trace in spec["data"]:
+        trace = dict(trace)
+        x = chart_x(trace["x"])
+        for i, other in enumerate(shared):
+            if np.array_equal(x, other):
+                trace["x"] = i
+                break
+        else:
+            trace["x"] = len(shared)
+            shared.append(x)
+            # 시작 시각(ms) + int32 오프셋. 초 단위로 68년까지 담고, 그보다 길면 분 단위
+            t0 = float(x[0]) if len(x) else 0.0
+            unit = 1000 if len(x) == 0 or x[-1] - t0 < 2 ** 31 * 1000 else 60000
+            xs.append({"t0": t0, "unit": unit, "dt": _typed_array((x - t0) // unit, "i4")})
+        for key, values in trace.items():
+            if isinstance(values, dict) and "bdata" in values:  # plotly가 이미 f8 typed array로 인코딩한 배열
+                values = np.frombuffer(base64.b64decode(values["bdata"]), dtype=values["dtype"])
+            if isinstance(values, (np.ndarray, pd.Series, pd.Index)) and values.dtype.kind in "fiu":
+                trace[key] = _typed_array(values)
+        marker = trace.get("marker")
+        if marker is not None and isinstance(marker.get("color"), (np.ndarray, list, tuple)):
+            # 양봉/음봉 색 배열은 색 목록 + 1바이트 코드로
+            levels, codes = np.unique(np.asarray(marker["color"], dtype=str), return_inverse=True)
+            if len(levels) <= 256:
+                trace["marker"] = {**marker, "color": {"levels": levels.tolist(), "codes": _typed_array(codes, "u1")}}
+        data.append(trace)
+    layout = spec["layout"]
+    for key in [k for k in layout if k.startswith("xaxis")] or ["xaxis"]:
+        layout[key] = {**layout.get(key, {}), "type": "date"}
+    return {"x": xs, "data": data, "layout": layout, "config": CHART_CONFIG}
+
+
+def figure_html(fig, src: str = PLOTLY_JS_SRC) -> str:
+    """차트별로는 압축 payload만 담고 plotly.js는 로컬 파일 하나(src)를 참조하는 HTML 조각"""
+    payload = _pio.json.to_json_plotly(figure_payload(fig))
+    return CHART_SHELL_HTML.format(src=src, js=CHART_RENDER_JS, payload=payload)
+
+
+def chart_webview_supported(page) -> bool:
+    """flet_webview가 설치되어 있고 WebView의 JS 실행을 지원하는 플랫폼(Android·iOS·macOS)인지"""
+    platform = str(getattr(page.platform, "value", page.platform)).lower()
+    if platform not in ("android", "ios", "macos"):
+        return False
+    try:
+        importlib.import_module("flet_webview")
+    except ImportError:
+        return False
+    return True
+
+
+def write_chart_file(idx: int, html: str) -> str:
+    """WebView가 읽을 idx번 차트 HTML 파일을 쓰고 file:// URL을 반환. plotly.min.js는 같은 폴더의 사본을 참조"""
+    folder = get_cache_dir("charts")
+    ensure_plotly_asset(folder)
+    # 내용이 바뀌면 URL도 바뀌어야 WebView가 다시 읽는다 - 이전 파일은 지운다
+    name = f"chart{idx}-{hashlib.sha1(html.encode('utf-8')).hexdigest()[:12]}.html"
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+    for old in os.listdir(folder):
+        if old.startswith(f"chart{idx}-") and old != name:
+            os.remove(os.path.join(folder, old))
+    return "file://" + path
+
+
+def prepare_render_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """차트 공통 렌더링 컬럼(양봉/음봉 색, MACD 히스토그램 색)을 벡터 연산으로 한 번만 계산"""
+    df["Candle_Color"] = np.where(df["Close"].to_numpy() >= df["Open"].to_numpy(), UP_COLOR, DOWN_COLOR)
+    df["Hist_Color"] = np.where(df["MACD_Hist"].to_numpy() >= 0, UP_COLOR, DOWN_COLOR)
+    return df
+
+
+# ========== 차트 다운샘플링 ==========
+CHART_MAX_POINTS = 1500  # 화면 폭을 모를 때(헤드리스 리포트 등) 차트당 최대 점 수
+CHART_MIN_POINTS = 300
+CHART_POINTS_PER_PX = 1.0  # 차트 폭 1px당 점 수 - 이보다 촘촘하면 눈으로 구분되지 않는다
+
+
+def chart_max_points(width_px: float | None) -> int:
+    """차트 영역 폭(px)에 비례하는 최대 점 수"""
+    if not width_px or width_px <= 0:
+        return CHART_MAX_POINTS
+    return max(CHART_MIN_POINTS, int(width_px * CHART_POINTS_PER_PX))
+
+
+# ========== 렌더링 모드 (SVG / WebGL) ==========
+RENDER_MODES = ("auto", "svg", "webgl")  # auto: 점이 많은 선만 WebGL / svg: 항상 SVG (WebGL 미지원 WebView용) / webgl: 항상 WebGL
+WEBGL_MIN_POINTS = 1000  # auto 모드에서 (다운샘플링 후) 이보다 점이 많은 선은 Scattergl로 그린다
+
+
+def line_trace(x, y, render_mode: str = "auto", **kwargs):
+    """점 수와 렌더링 모드에 따라 go.Scatter(SVG) 또는 go.Scattergl(WebGL) 선 트레이스"""
+    webgl = render_mode == "webgl" or (render_mode == "auto" and len(x) > WEBGL_MIN_POINTS)
+    return (go.Scattergl if webgl else go.Scatter)(x=x, y=y, **kwargs)
+
+
+def _lttb_kernel(x, v, picked):
+    """LTTB 선택 루프 (numba JIT 대상). picked의 길이만큼 점을 골라 위치를 채운다"""
+    n = x.shape[0]
+    n_out = picked.shape[0]
+    every = (n - 2) / (n_out - 2)
+    picked[0] = 0
+    picked[n_out - 1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nxt_hi = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(hi, nxt_hi):
+            avg_x += x[j]
+            avg_y += v[j]
+        avg_x /= nxt_hi - hi
+        avg_y /= nxt_hi - hi
+        # 이전 선택점 a, 다음 구간 평균점과 만드는 삼각형 넓이가 가장 큰 점을 고른다
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (v[j] - v[a]) - (x[a] - x[j]) * (avg_y - v[a]))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        picked[i + 1] = a
+    return picked
+
+
+def _lttb_numpy(x, v, picked):
+    """_lttb_kernel과 같은 선택을 구간 단위 numpy 연산으로 (numba가 없을 때)"""
+    n = len(x)
+    n_out = len(picked)
+    every = (n - 2) / (n_out - 2)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nxt_hi = min(int((i + 2) * every) + 1, n)
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = v[hi:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (v[lo:hi] - v[a]) - (x[a] - x[lo:hi]) * (avg_y - v[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets로 고른 점의 위치 (x는 봉 순서). NaN 구간은 건너뛴다"""
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= n_out or n_out < 3:
+        return valid
+    kernel = _load_kernel(_lttb_kernel, KERNEL_MODE) or _lttb_numpy
+    picked = kernel(valid.astype(np.float64), np.ascontiguousarray(y[valid]), np.empty(n_out, dtype=np.int64))
+    return valid[picked]
+
+
+def downsample_ohlc(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """연속 봉을 max_points개 구간으로 묶어 OHLC(시가=첫, 고가=최고, 저가=최저, 종가=끝)와 거래량 합으로 집계"""
+    n = len(df)
+    starts = np.unique(np.linspace(0, n, max_points + 1).astype(np.int64))[:-1]
+    ends = np.append(starts[1:], n)
+    high = df["High"].to_numpy(dtype=np.float64)
+    low = df["Low"].to_numpy(dtype=np.float64)
+    bars = pd.DataFrame({
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.fmax.reduceat(high, starts),
+        "Low": np.fmin.reduceat(low, starts),
+        "Close": df["Close"].to_numpy()[ends - 1],
+        "Volume": np.add.reduceat(df["Volume"].to_numpy(dtype=np.float64), starts),
+    }, index=df.index[starts])
+    bars["Candle_Color"] = np.where(bars["Close"].to_numpy() >= bars["Open"].to_numpy(), UP_COLOR, DOWN_COLOR)
+    return bars
+
+
+class ChartView:
+    """차트에 넘길 데이터. max_points보다 길면 캔들·거래량은 OHLC 구간 집계, 지표 선은 LTTB로 줄인다"""
+
+    def __init__(self, df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS):
+        self.df = df
+        self.max_points = max_points
+        self.reduced = max_points is not None and len(df) > max_points
+        self.bars = downsample_ohlc(df, max_points) if self.reduced else df
+
+    def line(self, col: str):
+        """(x, y) - 원본 해상도의 선을 LTTB로 고른 점"""
+        series = self.df[col]
+        if not self.reduced:
+            return series.index, series
+        idx = lttb_indices(series.to_numpy(dtype=np.float64), self.max_points)
+        return series.index[idx], series.to_numpy()[idx]
+
+
+def build_chart1_figure(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto"):
     """주가 + 거래량 + RSI"""
-    fig = make_subplots(
+    view = ChartView(df, max_points)
+    bars = view.bars
+    fig = _subplots.make_subplots(
         rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.06,
         row_heights=[0.65, 0.35], subplot_titles=("주가 및 거래량", "RSI (14)"),
         specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
     )
     fig.add_trace(
         go.Candlestick(
-            x=df.index, open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"],
-            name="주가", increasing_line_color="#26a69a", decreasing_line_color="#ef5350",
+            x=bars.index, open=bars["Open"], high=bars["High"], low=bars["Low"], close=bars["Close"],
+            name="주가", increasing_line_color=UP_COLOR, decreasing_line_color=DOWN_COLOR,
         ), row=1, col=1, secondary_y=False
     )
-    fig.add_trace(go.Scatter(x=df.index, y=df["MA20"], name="MA20", line=dict(color="#2196F3", width=2)), row=1, col=1, secondary_y=False)
-    fig.add_trace(go.Scatter(x=df.index, y=df["MA60"], name="MA60", line=dict(color="#FF9800", width=2)), row=1, col=1, secondary_y=False)
-    colors = ["#26a69a" if df["Close"].iloc[i] >= df["Open"].iloc[i] else "#ef5350" for i in range(len(df))]
-    fig.add_trace(go.Bar(x=df.index, y=df["Volume"], name="거래량", marker_color=colors, opacity=0.5), row=1, col=1, secondary_y=True)
-    fig.add_trace(go.Scatter(x=df.index, y=df["RSI"], name="RSI", line=dict(color="#9C27B0", width=2)), row=2, col=1)
+    x, y = view.line("MA20")
+    fig.add_trace(line_trace(x, y, render_mode, name="MA20", line=dict(color="#2196F3", width=2)), row=1, col=1, secondary_y=False)
+    x, y = view.line("MA60")
+    fig.add_trace(line_trace(x, y, render_mode, name="MA60", line=dict(color="#FF9800", width=2)), row=1, col=1, secondary_y=False)
+    fig.add_trace(go.Bar(x=bars.index, y=bars["Volume"], name="거래량", marker_color=bars["Candle_Color"], opacity=0.5), row=1, col=1, secondary_y=True)
+    x, y = view.line("RSI")
+    fig.add_trace(line_trace(x, y, render_mode, name="RSI", line=dict(color="#9C27B0", width=2)), row=2, col=1)
     fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.6, row=2, col=1)
     fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.6, row=2, col=1)
     fig.update_layout(xaxis_rangeslider_visible=False, template="plotly_white", height=500, margin=dict(l=40, r=20, t=40, b=40))
     fig.update_yaxes(title_text="주가", row=1, col=1, secondary_y=False)
     fig.update_yaxes(title_text="거래량", row=1, col=1, secondary_y=True)
     fig.update_yaxes(title_text="RSI", range=[0, 100], row=2, col=1)
-    return fig.to_html(include_plotlyjs="cdn", config={"displayModeBar": True, "responsive": True}, full_html=False)
+    return fig
+
+
+def build_chart1_html(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto") -> str:
+    return figure_html(build_chart1_figure(df, max_points, render_mode))
 
 
-def build_chart2_html(df: pd.DataFrame) -> str:
+def build_chart2_figure(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto"):
     """MACD"""
+    view = ChartView(df, max_points)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df.index, y=df["MACD"], name="MACD", line=dict(color="#2196F3")))
-    fig.add_trace(go.Scatter(x=df.index, y=df["MACD_Signal"], name="Signal", line=dict(color="#FF9800")))
-    colors_hist = ["#26a69a" if v >= 0 else "#ef5350" for v in df["MACD_Hist"]]
-    fig.add_trace(go.Bar(x=df.index, y=df["MACD_Hist"], name="Histogram", marker_color=colors_hist, opacity=0.7))
+    for col, name, color in (("MACD", "MACD", "#2196F3"), ("MACD_Signal", "Signal", "#FF9800")):
+        x, y = view.line(col)
+        fig.add_trace(line_trace(x, y, render_mode, name=name, line=dict(color=color)))
+    x, y = view.line("MACD_Hist")
+    colors = df["Hist_Color"] if not view.reduced else np.where(y >= 0, UP_COLOR, DOWN_COLOR)
+    fig.add_trace(go.Bar(x=x, y=y, name="Histogram", marker_color=colors, opacity=0.7))
     fig.add_hline(y=0, line_dash="dot", line_color="gray")
     fig.update_layout(template="plotly_white", height=400, title="MACD (12, 26, 9)", margin=dict(l=40, r=20, t=40, b=40))
-    return fig.to_html(include_plotlyjs="cdn", config={"displayModeBar": True, "responsive": True}, full_html=False)
+    return fig
 
 
-def build_chart3_html(df: pd.DataFrame) -> str:
+def build_chart2_html(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto") -> str:
+    return figure_html(build_chart2_figure(df, max_points, render_mode))
+
+
+def build_chart3_figure(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto"):
     """볼린저 밴드"""
+    view = ChartView(df, max_points)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df.index, y=df["Close"], name="종가", line=dict(color="#333")))
-    fig.add_trace(go.Scatter(x=df.index, y=df["BB_Upper"], name="상단밴드", line=dict(color="#ef5350", dash="dash")))
-    fig.add_trace(go.Scatter(x=df.index, y=df["BB_Middle"], name="중간(20일)", line=dict(color="#2196F3")))
-    fig.add_trace(go.Scatter(x=df.index, y=df["BB_Lower"], name="하단밴드", line=dict(color="#26a69a", dash="dash")))
+    for col, name, line in (
+        ("Close", "종가", dict(color="#333")),
+        ("BB_Upper", "상단밴드", dict(color="#ef5350", dash="dash")),
+        ("BB_Middle", "중간(20일)", dict(color="#2196F3")),
+        ("BB_Lower", "하단밴드", dict(color="#26a69a", dash="dash")),
+    ):
+        x, y = view.line(col)
+        fig.add_trace(line_trace(x, y, render_mode, name=name, line=line))
     fig.update_layout(template="plotly_white", height=400, title="볼린저 밴드 (20일, 2σ)", margin=dict(l=40, r=20, t=40, b=40))
-    return fig.to_html(include_plotlyjs="cdn", config={"displayModeBar": True, "responsive": True}, full_html=False)
+    return fig
+
+
+def build_chart3_html(df: pd.DataFrame, max_points: int | None = CHART_MAX_POINTS, render_mode: str = "auto") -> str:
+    return figure_html(build_chart3_figure(df, max_points, render_mode))
+
+
+# 차트별 트레이스 순서대로 {트레이스 속성: df 컬럼} - 스트리밍 때 새 봉만 보내는 데 사용
+CHART_PATCH_FIELDS = [
+    [{"open": "Open", "high": "High", "low": "Low", "close": "Close"}, {"y": "MA20"}, {"y": "MA60"},
+     {"y": "Volume", "marker.color": "Candle_Color"}, {"y": "RSI"}],
+    [{"y": "MACD"}, {"y": "MACD_Signal"}, {"y": "MACD_Hist", "marker.color": "Hist_Color"}],
+    [{"y": "Close"}, {"y": "BB_Upper"}, {"y": "BB_Middle"}, {"y": "BB_Lower"}],
+]
+
+
+def chart_patch_script(idx: int, tail: pd.DataFrame) -> str:
+    """tail(렌더링 컬럼 포함)의 봉들로 idx번 차트를 갱신하는 JS 호출 - 전체 figure 대신 새 점만 보낸다"""
+    traces = [
+        {key: _typed_array(tail[col].to_numpy(), "f8") if tail[col].dtype.kind in "biuf" else tail[col].tolist()
+         for key, col in fields.items()}
+        for fields in CHART_PATCH_FIELDS[idx]
+    ]
+    return f"window.staPatch({json.dumps({'x': chart_x(tail.index).tolist(), 'traces': traces})});"
+
+
+# 지표 탭 구성: (탭 이름, figure 생성 함수, 높이) - 차트는 탭을 처음 열 때 생성
+CHART_TABS = [
+    ("주가 + 거래량 + RSI", build_chart1_figure, 520),
+    ("MACD", build_chart2_figure, 420),
+    ("볼린저 밴드", build_chart3_figure, 420),
+]
+# 헤드리스 리포트용 차트: (파일 이름, figure 생성 함수)
+REPORT_CHARTS = [
+    ("price_volume_rsi", build_chart1_figure),
+    ("macd", build_chart2_figure),
+    ("bollinger", build_chart3_figure),
+]
+
+
+# ========== 명령줄 (헤드리스) ==========
+def _json_value(v):
+    if isinstance(v, (float, np.floating)):
+        return None if np.isnan(v) else float(v)
+    if isinstance(v, np.integer):
+        return int(v)
+    return v
+
+
+def write_report(ticker: str, period: int, out_dir: str, charts: bool = True, render_mode: str = "auto",
+                 interval: str = "1d") -> dict:
+    """한 종목을 분석해 <out_dir>/<티커>.json 요약과 차트 HTML을 저장. 차트는 <out_dir>/plotly.min.js를 참조 (ensure_plotly_asset)"""
+    df, name, summary = analyze_ticker(ticker, period, interval=interval)
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+    record = {
+        "ticker": ticker,
+        "name": name,
+        "period": period,
+        "interval": interval,
+        "as_of": df.index[-1].strftime("%Y-%m-%d" if interval == "1d" else "%Y-%m-%d %H:%M"),
+        **{k: _json_value(v) for k, v in summary.items()},
+        "last_bar": {c: _json_value(df[c].iloc[-1]) for c in OHLCV_COLUMNS + INDICATOR_COLUMNS},
+        "charts": [],
+    }
+    if charts:
+        for slug, builder in REPORT_CHARTS:
+            filename = f"{safe}_{slug}.html"
+            # plotly.min.js는 cmd_analyze가 out_dir에 한 번만 복사하고 모든 차트가 공유
+            builder(df, CHART_MAX_POINTS, render_mode).write_html(
+                os.path.join(out_dir, filename), include_plotlyjs=os.path.basename(PLOTLY_JS_SRC), config=CHART_CONFIG)
+            record["charts"].append(filename)
+    with open(os.path.join(out_dir, f"{safe}.json"), "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    return record
+
+
+def cmd_analyze(args) -> int:
+    tickers = parse_tickers(" ".join(args.tickers))
+    os.makedirs(args.out, exist_ok=True)
+    if not args.no_charts:
+        ensure_plotly_asset(args.out)  # 작업 스레드들이 같은 파일을 동시에 쓰지 않도록 시작 전에 한 번
+    set_io_workers(args.workers)
+    records, failed = [], 0
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="sta-report") as pool:
+        futures = {pool.submit(write_report, t, args.period, args.out, not args.no_charts, args.render, args.interval): t for t in tickers}
+        for future in as_completed(futures):
+            t = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[analyze] {t}: 실패 - {e}", file=sys.stderr)
+                continue
+            records.append(record)
+            rsi = record["rsi"] if record["rsi"] is not None else float("nan")
+            print(f"[analyze] {t}: {record['opinion']} (RSI {rsi:.1f})", file=sys.stderr)
+    order = {t: i for i, t in enumerate(tickers)}
+    records.sort(key=lambda r: order[r["ticker"]])
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump([{k: v for k, v in r.items() if k != "last_bar"} for r in records], f, ensure_ascii=False, indent=2)
+    print(f"[analyze] {len(records)}개 성공, {failed}개 실패 → {args.out}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_screen(args) -> int:
+    tickers = load_universe(args.universe)
+    if not tickers:
+        print("스크리닝할 티커가 없습니다. --universe 파일을 지정하거나 --refresh와 함께 실행하세요.", file=sys.stderr)
+        return 1
+    rows = []
+    for done, total, chunk_rows in run_screener(tickers, args.period, args.chunk_size, args.workers, args.refresh):
+        rows.extend(chunk_rows)
+        print(f"\r[screen] {done}/{total}", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    pd.DataFrame(rows, columns=[k for _, k in WATCHLIST_COLUMNS]).to_csv(args.out, index=False, encoding="utf-8-sig")
+    print(f"[screen] {len(rows)}개 종목 → {args.out}", file=sys.stderr)
+    return 0
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="main.py", description="주식 분석 프로그램 - 헤드리스 모드 (인자 없이 실행하면 GUI)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    analyze = sub.add_parser("analyze", help="종목별 지표·진단 JSON과 차트 HTML 리포트 생성 (한 종목이라도 실패하면 종료 코드 1)")
+    analyze.add_argument("tickers", nargs="+", help="분석할 티커 (예: AAPL TSLA 005930.KS)")
+    analyze.add_argument("--period", type=int, default=365, help="분석 기간 (일)")
+    analyze.add_argument("--out", default="report", help="리포트 출력 폴더")
+    analyze.add_argument("--workers", type=int, default=8, help="동시에 처리할 종목 수")
+    analyze.add_argument("--no-charts", action="store_true", help="차트 HTML 생략 (JSON만 저장)")
+    analyze.add_argument("--interval", choices=[k for k, _ in INTERVALS], default="1d",
+                         help="봉 간격 (분봉은 Yahoo 제한에 따라 기간이 줄어든다: 1m 28일, 5m/15m 58일, 1h 728일)")
+    analyze.add_argument("--render", choices=RENDER_MODES, default="auto", help="차트 선 렌더링 (SVG/WebGL)")
+    analyze.set_defaults(func=cmd_analyze)
+
+    screen = sub.add_parser("screen", help="유니버스 전체를 프로세스 풀로 스크리닝해 CSV로 저장")
+    screen.add_argument("--universe", help="티커 목록 파일 (기본: <캐시>/universe.txt, 없으면 캐시된 전체 티커)")
+    screen.add_argument("--period", type=int, default=365, help="분석 기간 (일)")
+    screen.add_argument("--chunk-size", type=int, default=SCREENER_CHUNK_SIZE, help="작업 단위 티커 수")
+    screen.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    screen.add_argument("--refresh", action="store_true", help="묶음별 yf.download로 캐시를 갱신한 뒤 스크리닝")
+    screen.add_argument("--out", default="screener.csv", help="결과 CSV 경로")
+    screen.set_defaults(func=cmd_screen)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
 
 
 # ========== 메인 앱 ==========
 def main(page: ft.Page):
-    page.title = "AAPL - 주식 분석 대시보드"
+    page.title = "주식 분석 대시보드"
     page.theme_mode = ft.ThemeMode.LIGHT
     page.padding = 0
     # Android APK 호환: window_min_* 제거 (모바일에서는 무의미)
 
     # 메인 컨텐츠 영역
     main_column = ft.Column(expand=True, scroll=ft.ScrollMode.AUTO)
+    runner = JobRunner()
+    page.on_close = lambda e: runner.cancel()  # 세션이 끝나면 대시보드 폴링(poll_bars) 스레드도 멈춘다
+    # 차트 호스트: WebView를 쓸 수 있으면 JS로 새 봉만 밀어 넣고, 아니면 Html 컨트롤에 HTML 전체를 다시 보낸다
+    chart_views = ([_webview.WebView(url="about:blank", expand=True) for _ in CHART_TABS]
+                   if chart_webview_supported(page) else None)
+    chart_src = os.path.basename(PLOTLY_JS_SRC) if chart_views else PLOTLY_JS_SRC
+
+    def get_chart_html(result: AnalysisResult, idx: int, max_points: int, render_mode: str, timer: StageTimer) -> str:
+        chart_key = (max_points, render_mode, idx, chart_src)
+        html = result.charts.get(chart_key)
+        if html is not None:
+            return html
+        with timer.stage(f"figure{idx + 1}"):
+            fig = CHART_TABS[idx][1](result.df, max_points, render_mode)
+        with timer.stage(f"payload{idx + 1}"):
+            html = figure_html(fig, chart_src)
+        timer.size(f"chart{idx + 1}_html", len(html))
+        get_analysis_cache().add_chart(result, chart_key, html)
+        return html
+
+    def set_chart(idx: int, html: str):
+        if chart_views is None:
+            chart_slots[idx].content = ft.Html(html, expand=True)
+        else:
+            chart_views[idx].url = write_chart_file(idx, html)
+
+    def clear_chart(idx: int):
+        # WebView는 탭을 다시 고를 때 새 URL을 받으므로 그대로 둔다
+        if chart_views is None:
+            chart_slots[idx].content = ft.ProgressRing(width=32, height=32)
+
+    # 대시보드 뷰: 컨트롤은 한 번만 만들고 로드·새로고침 때 값만 바꾼다 (클라이언트에는 바뀐 속성만 전송)
+    # rendered: 현재 key로 그려 둔 탭, live: 화면의 차트가 최신 결과와 같은 (패치 가능한) 선택 탭
+    dash = {"t": "", "p": 0, "interval": "1d", "result": None, "key": None, "rendered": set(), "live": None}
+
+    def render_tab(idx: int, tab_timer: StageTimer):
+        if idx in dash["rendered"]:
+            dash["live"] = idx
+            return False
+        key = dash["key"]
+        html = get_chart_html(dash["result"], idx, *key[1:], tab_timer)
+        if dash["key"] != key:
+            return False  # 차트를 만드는 사이 다른 로드가 대시보드를 바꿨다
+        dash["rendered"].add(idx)
+        dash["live"] = idx
+        set_chart(idx, html)
+        return True
+
+    def on_tab_change(e):
+        idx = int(e.control.selected_index)
+        if dash["result"] is None:
+            return
+        tab_timer = StageTimer("tab", ticker=dash["t"], period=dash["p"], tab=idx)
+        if render_tab(idx, tab_timer):
+            with tab_timer.stage("page_update"):
+                page.update()
+            tab_timer.write()
+
+    title_text = ft.Text(size=22, weight=ft.FontWeight.BOLD)
+    date_text = ft.Text(size=12, color=ft.Colors.GREY_600)
+    timer_text = ft.Text(size=11, color=ft.Colors.GREY_500, font_family="monospace", visible=DEBUG_OVERLAY)
+    price_text = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+    ma20_text = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+    ma60_text = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+    rsi_text = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+    opinion_text = ft.Text(size=14, weight=ft.FontWeight.W_600)
+    details_column = ft.Column(spacing=2)
+    chart_slots = [
+        ft.Container(
+            content=ft.ProgressRing(width=32, height=32) if chart_views is None else chart_views[i],
+            alignment=ft.alignment.center,
+            height=height,
+        )
+        for i, (_, _, height) in enumerate(CHART_TABS)
+    ]
+    chart_tabs = ft.Tabs(
+        selected_index=0,
+        tabs=[ft.Tab(text=name, content=slot) for (name, _, _), slot in zip(CHART_TABS, chart_slots)],
+        on_change=on_tab_change,
+        expand=1,
+    )
+    dashboard_view = ft.Column(
+        scroll=ft.ScrollMode.AUTO,
+        expand=True,
+        visible=False,
+        controls=[
+            ft.Container(
+                content=ft.Column([
+                    title_text,
+                    date_text,
+                    timer_text,
+                ], spacing=4),
+                padding=ft.padding.only(bottom=16),
+            ),
+            ft.Text("📊 주가 방향성 분석", size=16, weight=ft.FontWeight.W_600),
+            ft.Container(height=8),
+            ft.Row([
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text("현재가", size=12, color=ft.Colors.GREY_600),
+                        price_text,
+                    ], spacing=2),
+                    padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
+                ),
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text("20일 이평", size=12, color=ft.Colors.GREY_600),
+                        ma20_text,
+                    ], spacing=2),
+                    padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
+                ),
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text("60일 이평", size=12, color=ft.Colors.GREY_600),
+                        ma60_text,
+                    ], spacing=2),
+                    padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
+                ),
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text("RSI(14)", size=12, color=ft.Colors.GREY_600),
+                        rsi_text,
+                    ], spacing=2),
+                    padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
+                ),
+            ], spacing=12),
+            ft.Container(height=12),
+            ft.Container(
+                content=opinion_text,
+                padding=8, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT,
+            ),
+            ft.Container(height=4),
+            details_column,
+            ft.Container(height=20),
+            ft.Text("📉 기술적 지표", size=16, weight=ft.FontWeight.W_600),
+            ft.Container(height=8),
+            chart_tabs,
+        ],
+        spacing=8,
+    )
+
+    def fill_metrics(frame: pd.DataFrame, analysis: dict):
+        rsi_val = analysis["rsi"]
+        interval = dash["interval"]
+        date_text.value = (f"기준일: {frame.index[-1].strftime('%Y-%m-%d' if interval == '1d' else '%Y-%m-%d %H:%M')} | "
+                           f"기간: 최근 {dash['p']}일 ({dict(INTERVALS)[interval]}) | 데이터: Yahoo Finance")
+        price_text.value = f"${analysis['price']:,.2f}"
+        ma20_text.value = f"${analysis['ma20']:,.2f}" if not pd.isna(analysis["ma20"]) else "-"
+        ma60_text.value = f"${analysis['ma60']:,.2f}" if not pd.isna(analysis["ma60"]) else "-"
+        rsi_text.value = f"{rsi_val:.1f}"
+        rsi_text.color = ft.Colors.GREEN if rsi_val <= 30 else (ft.Colors.RED if rsi_val >= 70 else ft.Colors.AMBER)
+        opinion_text.value = f"진단: {analysis['opinion']}"
+        opinion_text.color = opinion_color_of(analysis["opinion"])
+        # 근거 문장 수가 같으면 기존 Text를 재사용해 값만 바꾼다
+        details = analysis["details"]
+        if len(details_column.controls) != len(details):
+            details_column.controls = [ft.Text(size=12) for _ in details]
+        for text, d in zip(details_column.controls, details):
+            text.value = f"• {d}"
+
+    def apply_bars(result: AnalysisResult, tail: pd.DataFrame, token: JobToken):
+        """자동 새로고침·스트리밍: 헤드라인 값을 바꾸고 보고 있는 탭의 차트를 갱신.
 
-    def load_data_and_display(t: str, p: int):
+        WebView 호스트면 그려진 차트에 tail(다시 받은 마지막 봉 + 새 봉)만 staPatch로 보낸다 (figure를 다시 만들지 않음).
+        Html 컨트롤은 JS를 실행할 수 없어 보고 있는 탭의 차트 HTML 전체를 다시 보낸다.
+        어느 쪽이든 보이지 않는 탭은 선택할 때 새 결과로 그린다.
+        """
+        key = (result.key,) + dash["key"][1:]
+        selected = int(chart_tabs.selected_index or 0)
+        tab_timer = StageTimer("stream", ticker=dash["t"], period=dash["p"], interval=dash["interval"], tab=selected)
+        patch = chart_views is not None and dash["live"] == selected
+        if patch:
+            with tab_timer.stage("patch"):
+                script = chart_patch_script(selected, tail)
+            tab_timer.size("patch_js", len(script))
+        else:
+            html = get_chart_html(result, selected, *key[1:], tab_timer)
+        token.check()
+        for idx in dash["rendered"] - {selected}:
+            clear_chart(idx)
+        if patch:
+            # 패치한 탭의 파일은 이전 결과 그대로라 탭을 떠났다 돌아오면 새로 그린다
+            dash.update(result=result, key=key, rendered=set())
+            chart_views[selected].run_javascript(script)
+        else:
+            dash.update(result=result, key=key, rendered={selected}, live=selected)
+            set_chart(selected, html)
+        fill_metrics(result.df, result.analysis)
+        with tab_timer.stage("page_update"):
+            page.update()
+        tab_timer.write(bars=len(result.df))
+
+    def show_dashboard(t: str, p: int, result: AnalysisResult, company_name: str, token: JobToken, timer: StageTimer,
+                       interval: str = "1d"):
+        """분석 결과의 값으로 대시보드 컨트롤을 갱신해 표시. 새 봉을 반영하는 apply_bars(result, tail, token)를 반환"""
+        # 사이드바(약 260px)를 뺀 화면 폭에 맞춰 차트 점 수를 정한다
+        max_points = chart_max_points((page.width or 0) - 260)
+        key = (result.key, max_points, render_dropdown.value)
+        selected = int(chart_tabs.selected_index or 0)
+        # 차트 HTML은 지역 변수로 먼저 만들고, 취소 여부를 확인한 뒤에만 공유 상태(dash, chart_slots)를 바꾼다
+        html = None
+        if key != dash["key"] or selected not in dash["rendered"]:
+            html = get_chart_html(result, selected, *key[1:], timer)
+        token.check()
+        # 같은 키로 이미 그려 둔 탭은 그대로 두고, 나머지는 스피너로 되돌려 탭 선택 시 생성
+        if key != dash["key"]:
+            for idx in dash["rendered"]:
+                clear_chart(idx)
+            dash["rendered"] = set()
+        dash.update(t=t, p=p, interval=interval, result=result, key=key, live=selected)
+        if html is not None:
+            dash["rendered"].add(selected)
+            set_chart(selected, html)
+
+        with timer.stage("controls"):
+            title_text.value = f"📈 {company_name} ({t}) 주식 분석"
+            fill_metrics(result.df, result.analysis)
+            timer_text.value = timer.summary()
+            show_view(dashboard_view)
+        with timer.stage("page_update"):
+            page.update()
+        if timer_text.visible:
+            timer_text.value = timer.summary()
+            page.update()
+        return apply_bars
+
+    def poll_bars(t: str, p: int, interval: str, start_date: datetime, result: AnalysisResult, token: JobToken, apply_bars):
+        """대시보드를 열어 둔 동안 마지막 봉 이후만 조회해 캐시·지표 상태에 이어 붙이고 헤드라인 값과 보고 있는 탭의 차트를 갱신.
+
+        분봉은 항상, 일봉은 자동 새로고침을 켰을 때만 조회한다. 새 봉이 없거나 조회가 실패하면 주기를 두 배씩 늘리고,
+        장 마감 후에는 마지막 봉을 한 번 받은 뒤 다음 개장까지 드물게만 깨어난다. 개장하면 주기를 처음 값으로 되돌린다.
+        """
+        df = result.df
+        base = INTRADAY_REFRESH_SEC.get(interval, AUTO_REFRESH_SEC)
+        delay = base
+        closed_synced = False
+        was_open = False
+        while True:
+            if interval == "1d" and not auto_refresh_switch.value:
+                token.sleep(base)
+                continue
+            is_open, until_open = market_session(getattr(df.index, "tz", None))
+            if is_open and not was_open:
+                delay = base  # 개장: 마감 동안 늘어난 주기를 되돌린다
+            was_open = is_open
+            if not is_open and closed_synced:
+                token.sleep(min(max(until_open, base), AUTO_REFRESH_OFF_HOURS_SEC))
+                continue
+            token.sleep(delay)
+            try:
+                if interval == "1d":
+                    new = load_history(t, start_date, datetime.now(), max_age=0)
+                else:
+                    new = load_intraday(t, start_date, datetime.now(), interval, max_age=0)
+            except Exception:
+                delay = min(delay * 2, AUTO_REFRESH_MAX_SEC)
+                continue
+            token.check()
+            closed_synced = not is_open
+            if new.empty or (len(new) == len(df) and new[OHLCV_COLUMNS].tail(1).equals(df[OHLCV_COLUMNS].tail(1))):
+                delay = min(delay * 2, AUTO_REFRESH_MAX_SEC)
+                continue
+            delay = base
+            last = df.index[-1]
+            stale = result.key
+            result = analyze_bars(t, p, interval, new)
+            token.check()
+            apply_bars(result, result.df.loc[result.df.index >= last], token)  # 캐시 적중이면 new에는 지표 컬럼이 없다
+            get_analysis_cache().discard(stale)  # 새 봉이 붙은 결과로 대체되어 다시 볼 일이 없다
+            df = new
+
+    def load_data_and_display(t: str, p: int, token: JobToken | None = None, from_snapshot: bool = False,
+                              interval: str = "1d"):
+        token = token or JobToken()
+        requested = p
+        p = min(p, intraday_max_days(interval))  # 분봉은 Yahoo 조회 가능 기간까지만
         try:
-            stock = yf.Ticker(t)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=p)
-            df = stock.history(start=start_date, end=end_date, auto_adjust=True)
-            info = stock.info
+            snapshot = None
+            if from_snapshot:
+                # 지난 세션 데이터를 네트워크 없이 디스크 캐시에서 먼저 표시
+                timer = StageTimer("snapshot", ticker=t, period=p)
+                with timer.stage("history"):
+                    if interval == "1d":
+                        cached = load_history(t, start_date, end_date, auto_adjust=True, offline=True)
+                    else:
+                        cached = load_intraday(t, start_date, end_date, interval, offline=True)
+                timer.size("history", cached.memory_usage(deep=False).sum())
+                if len(cached) >= MIN_BARS:
+                    snapshot = [analyze_bars(t, p, interval, cached, timer), get_metadata_cache().peek(t) or t, None]
+                    snapshot[2] = show_dashboard(t, p, snapshot[0], snapshot[1], token, timer, interval)
+                    timer.write(bars=len(cached))
+
+            timer = StageTimer("load", ticker=t, period=p)
+            df, company_name = fetch_inputs(t, start_date, end_date, auto_adjust=True, timer=timer, interval=interval)
+            token.check()
 
-            if df.empty or len(df) < 60:
+            if df.empty or len(df) < MIN_BARS:
                 page.show_snack_bar(ft.SnackBar(content=ft.Text("데이터가 부족합니다. 티커를 확인 후 다시 시도하세요."), open=True))
                 return
-
-            df["MA20"] = df["Close"].rolling(window=20).mean()
-            df["MA60"] = df["Close"].rolling(window=60).mean()
-            df["RSI"] = calc_rsi(df["Close"], 14)
-            macd_line, signal_line, hist = calc_macd(df["Close"])
-            df["MACD"] = macd_line
-            df["MACD_Signal"] = signal_line
-            df["MACD_Hist"] = hist
-            bb_ma, bb_upper, bb_lower = calc_bollinger(df["Close"])
-            df["BB_Middle"] = bb_ma
-            df["BB_Upper"] = bb_upper
-            df["BB_Lower"] = bb_lower
-
-            company_name = info.get("longName") or info.get("shortName") or t
-            last = df.iloc[-1]
-            current_price = last["Close"]
-            ma20_val = last["MA20"]
-            ma60_val = last["MA60"]
-            rsi_val = last["RSI"]
-            analysis = get_direction_analysis(current_price, ma20_val, ma60_val, rsi_val)
-
-            # 진단 색상
-            if "상승 추세" in analysis["opinion"]:
-                opinion_color = ft.Colors.GREEN
-            elif "하락 추세" in analysis["opinion"]:
-                opinion_color = ft.Colors.RED
+            # 같은 데이터로 계산해 둔 결과가 있으면 지표·진단·차트를 다시 만들지 않는다 (A → B → A 전환)
+            result = analyze_bars(t, p, interval, df, timer)
+            token.check()
+            if snapshot is not None and company_name == snapshot[1] and result is snapshot[0]:
+                timer.write(bars=len(df), unchanged=True)
+                apply_bars = snapshot[2]
             else:
-                opinion_color = ft.Colors.ORANGE
+                apply_bars = show_dashboard(t, p, result, company_name, token, timer, interval)
+                timer.write(bars=len(df))
+            save_session(ticker=t, period=requested, interval=interval)
+            poll_bars(t, p, interval, start_date, result, token, apply_bars)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            if token.cancelled:
+                return
+            page.show_snack_bar(ft.SnackBar(content=ft.Text(f"데이터 로드 오류: {e}"), open=True))
+            page.update()
 
-            rsi_color = ft.Colors.GREEN if rsi_val <= 30 else (ft.Colors.RED if rsi_val >= 70 else ft.Colors.AMBER)
-            ma20_str = f"${ma20_val:,.2f}" if not pd.isna(ma20_val) else "-"
-            ma60_str = f"${ma60_val:,.2f}" if not pd.isna(ma60_val) else "-"
+    watch_state = {"rows": [], "period": 365, "sort_index": 0, "ascending": True, "title": "", "progress": None}
 
-            content = ft.Column(
-                scroll=ft.ScrollMode.AUTO,
-                expand=True,
-                controls=[
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"📈 {company_name} ({t}) 주식 분석", size=22, weight=ft.FontWeight.BOLD),
-                            ft.Text(f"기준일: {df.index[-1].strftime('%Y-%m-%d')} | 기간: 최근 {p}일 | 데이터: Yahoo Finance", size=12, color=ft.Colors.GREY_600),
-                        ], spacing=4),
-                        padding=ft.padding.only(bottom=16),
-                    ),
-                    ft.Text("📊 주가 방향성 분석", size=16, weight=ft.FontWeight.W_600),
-                    ft.Container(height=8),
-                    ft.Row([
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("현재가", size=12, color=ft.Colors.GREY_600),
-                                ft.Text(f"${current_price:,.2f}", size=18, weight=ft.FontWeight.BOLD),
-                            ], spacing=2),
-                            padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("20일 이평", size=12, color=ft.Colors.GREY_600),
-                                ft.Text(ma20_str, size=18, weight=ft.FontWeight.BOLD),
-                            ], spacing=2),
-                            padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("60일 이평", size=12, color=ft.Colors.GREY_600),
-                                ft.Text(ma60_str, size=18, weight=ft.FontWeight.BOLD),
-                            ], spacing=2),
-                            padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("RSI(14)", size=12, color=ft.Colors.GREY_600),
-                                ft.Text(f"{rsi_val:.1f}", size=18, weight=ft.FontWeight.BOLD, color=rsi_color),
-                            ], spacing=2),
-                            padding=12, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT, expand=True,
-                        ),
-                    ], spacing=12),
-                    ft.Container(height=12),
-                    ft.Container(
-                        content=ft.Text(f"진단: {analysis['opinion']}", size=14, weight=ft.FontWeight.W_600, color=opinion_color),
-                        padding=8, border_radius=8, bgcolor=ft.Colors.SURFACE_VARIANT,
-                    ),
-                    ft.Container(height=4),
-                    ft.Column([ft.Text(f"• {d}", size=12) for d in analysis["details"]], spacing=2),
-                    ft.Container(height=20),
-                    ft.Text("📉 기술적 지표", size=16, weight=ft.FontWeight.W_600),
-                    ft.Container(height=8),
-                    ft.Tabs(
-                        selected_index=0,
-                        tabs=[
-                            ft.Tab(
-                                text="주가 + 거래량 + RSI",
-                                content=ft.Container(
-                                    content=ft.Html(build_chart1_html(df), expand=True),
-                                    height=520,
-                                ),
-                            ),
-                            ft.Tab(
-                                text="MACD",
-                                content=ft.Container(
-                                    content=ft.Html(build_chart2_html(df), expand=True),
-                                    height=420,
-                                ),
-                            ),
-                            ft.Tab(
-                                text="볼린저 밴드",
-                                content=ft.Container(
-                                    content=ft.Html(build_chart3_html(df), expand=True),
-                                    height=420,
-                                ),
-                            ),
-                        ],
-                        expand=1,
-                    ),
-                ],
-                spacing=8,
-            )
-            main_column.controls.clear()
-            main_column.controls.append(content)
+    def opinion_color_of(opinion: str):
+        if "상승 추세" in opinion:
+            return ft.Colors.GREEN
+        if "하락 추세" in opinion:
+            return ft.Colors.RED
+        return ft.Colors.ORANGE
+
+    def build_watchlist_table() -> ft.DataTable:
+        key = WATCHLIST_COLUMNS[watch_state["sort_index"]][1]
+        present = [r for r in watch_state["rows"] if r[key] is not None]
+        missing = [r for r in watch_state["rows"] if r[key] is None]
+        rows = (sorted(present, key=lambda r: r[key], reverse=not watch_state["ascending"]) + missing)[:TABLE_MAX_ROWS]
+
+        def fmt(r, k):
+            if r[k] is None:
+                return "-"
+            if k in ("price", "ma20", "ma60"):
+                return f"{r[k]:,.2f}"
+            if k == "rsi":
+                return f"{r[k]:.1f}"
+            return str(r[k])
+
+        def open_ticker(t):
+            def handler(e):
+                ticker_input.value = t
+                start_analysis(t, watch_state["period"])
+            return handler
+
+        return ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text(label), numeric=k in ("price", "ma20", "ma60", "rsi"), on_sort=on_watch_sort)
+                for label, k in WATCHLIST_COLUMNS
+            ],
+            rows=[
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(fmt(r, k), color=opinion_color_of(r[k]) if k == "opinion" else None))
+                        for _, k in WATCHLIST_COLUMNS
+                    ],
+                    on_select_changed=open_ticker(r["ticker"]),
+                )
+                for r in rows
+            ],
+            sort_column_index=watch_state["sort_index"],
+            sort_ascending=watch_state["ascending"],
+        )
+
+    def show_watchlist():
+        count = len(watch_state["rows"])
+        hint = "열 제목을 누르면 정렬, 행을 누르면 해당 종목 대시보드로 이동합니다."
+        if count > TABLE_MAX_ROWS:
+            hint += f" (정렬 기준 상위 {TABLE_MAX_ROWS}개만 표시)"
+        list_view.controls = [
+            ft.Text(f"{watch_state['title']} {count}개 | 기간: 최근 {watch_state['period']}일", size=22, weight=ft.FontWeight.BOLD),
+            ft.Text(hint, size=12, color=ft.Colors.GREY_600),
+            *([ft.ProgressBar(value=watch_state["progress"])] if watch_state["progress"] is not None else []),
+            ft.Container(height=8),
+            build_watchlist_table(),
+        ]
+        show_view(list_view)
+        page.update()
+
+    def on_watch_sort(e):
+        watch_state["sort_index"] = e.column_index
+        watch_state["ascending"] = e.ascending
+        show_watchlist()
+
+    def load_watchlist(tickers: list[str], p: int, token: JobToken | None = None):
+        token = token or JobToken()
+        try:
+            rows = analyze_watchlist(tickers, p)
+            token.check()
+            watch_state.update(rows=rows, period=p, title="⭐ 관심종목", progress=None)
+            show_watchlist()
+            save_session(watchlist=", ".join(tickers))
+        except JobCancelled:
+            raise
+        except Exception as e:
+            if token.cancelled:
+                return
+            page.show_snack_bar(ft.SnackBar(content=ft.Text(f"관심종목 로드 오류: {e}"), open=True))
             page.update()
+
+    def on_watchlist(e):
+        tickers = parse_tickers(watchlist_input.value)
+        if not tickers:
+            return
+        p = int(period_slider.value)
+        page.title = "관심종목 - 주식 분석 대시보드"
+        show_loading(f"관심종목 {len(tickers)}개")
+        runner.submit(load_watchlist, tickers, p)
+
+    def load_screener(tickers: list[str], p: int, token: JobToken | None = None):
+        """청크가 끝날 때마다 결과 표와 진행률을 갱신 (스트리밍)"""
+        token = token or JobToken()
+        rows = []
+        watch_state.update(rows=rows, period=p, title="🔎 스크리너", progress=0.0)
+        screener = run_screener(tickers, p)
+        try:
+            for done, total, chunk_rows in screener:
+                token.check()
+                rows.extend(chunk_rows)
+                watch_state["progress"] = done / total if done < total else None
+                show_watchlist()
+        except JobCancelled:
+            raise
         except Exception as e:
-            page.show_snack_bar(ft.SnackBar(content=ft.Text(f"데이터 로드 오류: {e}"), open=True))
+            if token.cancelled:
+                return
+            page.show_snack_bar(ft.SnackBar(content=ft.Text(f"스크리너 오류: {e}"), open=True))
+            page.update()
+        finally:
+            screener.close()
+
+    def on_screener(e):
+        tickers = load_universe()
+        if not tickers:
+            page.show_snack_bar(ft.SnackBar(content=ft.Text("스크리닝할 티커가 없습니다. universe.txt를 준비하세요."), open=True))
             page.update()
+            return
+        page.title = "스크리너 - 주식 분석 대시보드"
+        show_loading(f"스크리너 {len(tickers)}개")
+        runner.submit(load_screener, tickers, int(period_slider.value))
 
     def on_analyze(e):
         t = (ticker_input.value or "AAPL").strip().upper()
         p = int(period_slider.value)
+        start_analysis(t, p)
+
+    def start_analysis(t: str, p: int, from_snapshot: bool = False):
         page.title = f"{t} - 주식 분석 대시보드"
-        main_column.controls.clear()
-        main_column.controls.append(
-            ft.Container(
-                content=ft.Column([
-                    ft.ProgressRing(width=48, height=48),
-                    ft.Text(f"{t} 데이터 로딩 중...", size=14, color=ft.Colors.GREY_600),
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=16, expand=True),
-                alignment=ft.alignment.center,
-                expand=True,
-            )
-        )
+        show_loading(t)
+        runner.submit(load_data_and_display, t, p, from_snapshot=from_snapshot, interval=interval_dropdown.value)
+
+    def show_loading(label: str):
+        loading_text.value = f"{label} 데이터 로딩 중..."
+        show_view(loading_view)
         page.update()
-        load_data_and_display(t, p)
 
-    # 사이드바
+    def show_view(view: ft.Control):
+        """메인 영역의 화면(안내·로딩·대시보드·목록) 중 하나만 보이게 한다. 컨트롤 트리는 그대로 두고 visible만 바꾼다"""
+        for control in main_column.controls:
+            control.visible = control is view
+
+    # 사이드바 (지난 세션의 티커·기간 복원)
+    session = load_session()
     ticker_input = ft.TextField(
         label="종목 티커 입력",
-        value="AAPL",
+        value=session["ticker"],
         hint_text="예: AAPL, TSLA, MSFT, 005930.KS",
         width=220,
     )
     period_slider = ft.Slider(
-        min=90, max=365, value=365, divisions=27,
-        label="분석 기간 (일)",
+        min=PERIOD_MIN_DAYS, max=PERIOD_MAX_DAYS, value=session["period"],
+        divisions=(PERIOD_MAX_DAYS - PERIOD_MIN_DAYS) // 10,
+        label="분석 기간 {value}일",
     )
+    render_dropdown = ft.Dropdown(
+        label="차트 렌더링",
+        value=session["render_mode"],
+        options=[
+            ft.dropdown.Option("auto", "자동 (긴 선만 WebGL)"),
+            ft.dropdown.Option("svg", "SVG"),
+            ft.dropdown.Option("webgl", "WebGL"),
+        ],
+        on_change=lambda e: save_session(render_mode=e.control.value),
+        width=220,
+    )
+    interval_dropdown = ft.Dropdown(
+        label="봉 간격",
+        value=session["interval"],
+        options=[ft.dropdown.Option(key, label) for key, label in INTERVALS],
+        width=220,
+    )
+    auto_refresh_switch = ft.Switch(
+        label="자동 새로고침 (장중 일봉)",
+        value=session["auto_refresh"],
+        on_change=lambda e: save_session(auto_refresh=e.control.value),
+    )
+
+    def on_debug_overlay(e):
+        timer_text.visible = e.control.value
+        save_session(debug_overlay=e.control.value)
+        page.update()
+
+    timer_text.visible = session["debug_overlay"] or DEBUG_OVERLAY
+    debug_overlay_switch = ft.Switch(label="디버그 오버레이 (단계별 시간)", value=timer_text.visible, on_change=on_debug_overlay)
     analyze_btn = ft.ElevatedButton("분석 시작", icon=ft.Icons.PLAY_ARROW, on_click=on_analyze, width=220)
+    watchlist_input = ft.TextField(
+        label="관심종목 (쉼표·줄바꿈 구분)",
+        value=session["watchlist"],
+        multiline=True,
+        min_lines=2,
+        max_lines=6,
+        width=220,
+    )
+    watchlist_btn = ft.OutlinedButton("관심종목 분석", icon=ft.Icons.STAR, on_click=on_watchlist, width=220)
+    screener_btn = ft.OutlinedButton("스크리너 실행", icon=ft.Icons.MANAGE_SEARCH, on_click=on_screener, width=220)
 
     sidebar = ft.Container(
         content=ft.Column([
@@ -334,8 +2416,21 @@ def main(page: ft.Page):
             ticker_input,
             ft.Container(height=8),
             period_slider,
+            ft.Container(height=8),
+            interval_dropdown,
+            ft.Container(height=8),
+            render_dropdown,
+            ft.Container(height=8),
+            auto_refresh_switch,
+            debug_overlay_switch,
             ft.Container(height=16),
             analyze_btn,
+            ft.Container(height=16),
+            watchlist_input,
+            ft.Container(height=8),
+            watchlist_btn,
+            ft.Container(height=8),
+            screener_btn,
             ft.Container(height=24),
             ft.Divider(),
             ft.Text("사용법", size=14, weight=ft.FontWeight.W_600),
@@ -349,16 +2444,30 @@ def main(page: ft.Page):
         border=ft.border.only(right=ft.BorderSide(1, ft.Colors.OUTLINE_VARIANT)),
     )
 
-    # 메인 영역 초기 상태
-    main_column.controls.append(
+    # 메인 영역: 화면별 컨트롤을 한 번만 붙이고 show_view로 전환 (초기 상태는 안내 문구)
+    loading_text = ft.Text(size=14, color=ft.Colors.GREY_600)
+    loading_view = ft.Container(
+        content=ft.Column([
+            ft.ProgressRing(width=48, height=48),
+            loading_text,
+        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=16, expand=True),
+        alignment=ft.alignment.center,
+        expand=True,
+        visible=False,
+    )
+    list_view = ft.Column(spacing=4, visible=False)
+    main_column.controls = [
         ft.Container(
             content=ft.Column([
                 ft.Text("종목을 입력하고 '분석 시작'을 클릭하세요.", size=14, color=ft.Colors.GREY_600),
             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, expand=True),
             alignment=ft.alignment.center,
             expand=True,
-        )
-    )
+        ),
+        loading_view,
+        dashboard_view,
+        list_view,
+    ]
 
     page.add(
         ft.Row([
@@ -370,10 +2479,19 @@ def main(page: ft.Page):
             ),
         ], expand=True),
     )
+    report_startup_timings(module_import=MODULE_IMPORT_SEC, first_frame=time.perf_counter() - _IMPORT_T0)
+    # 첫 화면을 그린 뒤에 차트용 모듈까지 미리 import (첫 프레임과 GIL을 다투지 않도록)
+    threading.Thread(target=warm_imports, daemon=True).start()
 
-    # 초기 로드
-    load_data_and_display("AAPL", 365)
+    # 초기 로드: 지난 세션 종목을 캐시로 먼저 그리고 최신 데이터는 백그라운드에서 반영
+    start_analysis(session["ticker"], session["period"], from_snapshot=True)
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
+    try:
+        ensure_plotly_asset()
+    except OSError:
+        pass  # Android 패키지는 빌드 시 assets에 포함되어 있고 앱 폴더는 읽기 전용
+    ft.app(target=main, assets_dir="assets")
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""회귀 테스트 공통 설정 - pytest tests"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def app_storage(tmp_path, monkeypatch):
+    """디스크 캐시·세션 파일을 테스트마다 임시 폴더에 둔다"""
+    monkeypatch.setenv("FLET_APP_STORAGE_DATA", str(tmp_path))
+    return tmp_path
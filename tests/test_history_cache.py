@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""일봉 디스크 캐시: yf.download(tz 없음)로 저장한 뒤 stock.history(tz 있음)로 이어 받는 경로"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+TZ = "America/New_York"
+DAYS = pd.bdate_range("2024-01-02", "2024-06-28")
+
+
+def ohlcv(index) -> pd.DataFrame:
+    close = 100 + np.arange(len(index), dtype=float)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(len(index), 1000.0)}, index=index)
+
+
+FULL = ohlcv(DAYS.tz_localize(TZ))
+
+
+class FakeTicker:
+    """stock.history처럼 거래소 시간대가 붙은 인덱스를 돌려준다 (end 미포함)"""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, start, end, auto_adjust=True):
+        idx = FULL.index.tz_localize(None)
+        return FULL.loc[(idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))]
+
+
+class FakeYf:
+    Ticker = FakeTicker
+
+
+@pytest.fixture(autouse=True)
+def fake_yf(monkeypatch):
+    monkeypatch.setattr(main, "yf", FakeYf)
+
+
+def download(start, end) -> pd.DataFrame:
+    """일봉 yf.download 결과처럼 tz 없는 인덱스"""
+    frame = FULL.copy()
+    frame.index = frame.index.tz_localize(None)
+    return frame.loc[start:end]
+
+
+def test_store_then_load_refetches_tail():
+    main.store_history("AAA", download("2024-01-02", "2024-03-29"), datetime(2024, 1, 2), datetime(2024, 3, 29))
+    df = main.load_history("AAA", datetime(2024, 1, 2), datetime(2024, 6, 29), max_age=0)
+    assert str(df.index.tz) == TZ
+    assert len(df) == len(FULL)
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    np.testing.assert_array_equal(df["Close"].to_numpy(), FULL["Close"].to_numpy())
+
+
+def test_store_merges_into_tz_aware_cache():
+    main.load_history("BBB", datetime(2024, 1, 2), datetime(2024, 2, 29))
+    main.store_history("BBB", download("2024-02-01", "2024-04-30"), datetime(2024, 2, 1), datetime(2024, 4, 30))
+    df = main.load_history("BBB", datetime(2024, 1, 2), datetime(2024, 5, 1), offline=True)
+    assert str(df.index.tz) == TZ
+    assert df.index[0] == FULL.index[0] and df.index[-1] == FULL.loc[:"2024-04-30"].index[-1]
+    assert df.index.is_unique
+
+
+def test_store_without_overlap_keeps_cached_bars():
+    main.load_history("CCC", datetime(2024, 1, 2), datetime(2024, 1, 31))
+    main.store_history("CCC", download("2024-05-01", "2024-06-28"), datetime(2024, 5, 1), datetime(2024, 6, 28))
+    rec = main._read_ohlcv_cache(main._ohlcv_cache_path("CCC", True))
+    assert rec["df"].index[0] == pd.Timestamp("2024-01-02")  # 앞쪽 캐시를 버리지 않는다
+    # 비어 있던 2~4월은 다음 조회 때 받아서 채운다
+    df = main.load_history("CCC", datetime(2024, 1, 2), datetime(2024, 6, 29), max_age=0)
+    assert len(df) == len(FULL)
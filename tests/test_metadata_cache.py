@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""종목명 캐시: 디스크 저장 실패와 종목명이 없는 티커"""
+
+import os
+
+import pytest
+
+import main
+
+
+class FakeYf:
+    calls = []
+    infos = {"AAPL": {"longName": "Apple Inc."}}
+
+    class Ticker:
+        def __init__(self, ticker):
+            FakeYf.calls.append(ticker)
+            self.info = FakeYf.infos.get(ticker, {})
+
+
+@pytest.fixture(autouse=True)
+def fake_yf(monkeypatch):
+    FakeYf.calls = []
+    monkeypatch.setattr(main, "yf", FakeYf)
+
+
+def test_save_error_keeps_name_in_memory(tmp_path):
+    # 저장 경로가 폴더라 os.replace가 실패한다
+    path = tmp_path / "meta"
+    os.makedirs(path / "x")
+    cache = main.MetadataCache(str(path))
+    assert cache.get_name("AAPL") == "Apple Inc."
+    assert cache.get_name("AAPL") == "Apple Inc."
+    assert FakeYf.calls == ["AAPL"]
+
+
+def test_missing_name_is_cached_for_miss_ttl(tmp_path):
+    cache = main.MetadataCache(str(tmp_path / "meta.json"), miss_ttl=3600)
+    assert cache.get_name("ZZZZ") == "ZZZZ"
+    assert cache.get_name("ZZZZ") == "ZZZZ"
+    assert cache.peek("ZZZZ") is None
+    assert FakeYf.calls == ["ZZZZ"]
+    # 다시 읽어도 기억한다
+    assert main.MetadataCache(str(tmp_path / "meta.json")).get_name("ZZZZ") == "ZZZZ"
+    assert FakeYf.calls == ["ZZZZ"]
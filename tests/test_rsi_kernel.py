@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""RSI 커널(순수 파이썬·numba JIT)이 pandas 경로(calc_rsi_pandas)와 비트 단위로 같은지"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+rng = np.random.default_rng(0)
+WALK = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+
+
+def with_nan(values, *slices):
+    values = values.copy()
+    for s in slices:
+        values[s] = np.nan
+    return values
+
+
+CASES = {
+    "random_walk": WALK,
+    "leading_nan": with_nan(WALK, slice(0, 30)),
+    "middle_nan": with_nan(WALK, 100, slice(500, 504)),
+    "flat": np.full(50, 5.0),  # 상승·하락이 모두 0 → 0/0 = NaN
+    "flat_then_rise": np.r_[np.full(20, 5.0), np.linspace(5, 6, 30)],  # 하락 0 → 100
+    "rounded": np.round(WALK, 1),
+    "shorter_than_period": WALK[:10],
+    "empty": np.array([]),
+}
+
+
+@pytest.fixture(params=["python", "auto"])
+def kernel(request):
+    kernel = main._load_kernel(main._wilder_rsi_kernel, request.param)
+    if kernel is None:
+        pytest.skip("numba가 설치되어 있지 않다")
+    return kernel
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_kernel_matches_pandas(kernel, name):
+    values = CASES[name]
+    expected = main.calc_rsi_pandas(pd.Series(values)).to_numpy()
+    np.testing.assert_array_equal(main.calc_rsi_kernel(values, 14, kernel), expected)
+
+
+def test_kernel_matches_pandas_per_column(kernel):
+    # wide DataFrame(날짜 × 티커): 상장일이 다른 종목도 열마다 단독 계산과 같아야 한다
+    wide = pd.DataFrame({"a": CASES["random_walk"], "b": CASES["leading_nan"], "c": CASES["middle_nan"]})
+    expected = main.calc_rsi_pandas(wide).to_numpy()
+    np.testing.assert_array_equal(main.calc_rsi_kernel(wide.to_numpy(), 14, kernel), expected)